@@ -10,16 +10,53 @@ Modular Structure:
 """
 
 import os
-from flask import Flask, render_template, g
+import gzip
+import zlib
+from flask import Flask, render_template, g, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
 
 from routes.api import api
 from models.database import get_database
 
 
+# Response compression
+COMPRESS_PATHS = ('/api/screener', '/api/stock')
+COMPRESS_MIN_SIZE = 1024
+
+
+def gzip_stream(chunks):
+    """Gzip an iterable of byte chunks without buffering the whole body"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson; scan results carry NumPy scalars"""
+
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.options), mimetype='application/json')
+
+
 def create_app():
     """Application factory"""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     CORS(app)
     
     # Configuration
@@ -39,12 +76,39 @@ def create_app():
     def index():
         return render_template('index.html')
     
+    # Compress large scan payloads (screener results run to hundreds of KB)
+    @app.after_request
+    def compress_response(response):
+        if (not request.path.startswith(COMPRESS_PATHS)
+                or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()
+                or response.status_code != 200
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        # Streamed scan results are compressed chunk by chunk as they go out
+        if response.is_streamed:
+            response.response = gzip_stream(response.response)
+            response.headers.pop('Content-Length', None)
+            response.headers['Content-Encoding'] = 'gzip'
+            response.vary.add('Accept-Encoding')
+            return response
+
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+    
     # Cleanup
     @app.teardown_appcontext
     def close_db(exception):
         db = g.pop('db', None)
         if db is not None:
-            db.close()
+            get_database().release_connection(db)
     
     return app
 
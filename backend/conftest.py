@@ -0,0 +1 @@
+"""pytest configuration: puts backend/ on sys.path so tests import `services` like the app does"""
@@ -4,12 +4,66 @@ SQLite database operations and schema management
 """
 
 import sqlite3
-import json
 import os
+import queue
+import time
+import orjson
 from datetime import datetime
 from typing import Optional, List, Dict
 
 
+# Idle connections kept open for reuse across requests
+POOL_SIZE = 8
+
+# Pooled connections rarely close, so PRAGMA optimize also runs on release
+# at most this often
+OPTIMIZE_INTERVAL_SECONDS = 3600
+
+# Stored in PRAGMA user_version once the schema, migrations and defaults are in
+# place; bump it whenever the DDL or migrations below change
+SCHEMA_VERSION = 3
+
+# Hash method for the seeded default user (werkzeug's default runs 600k rounds)
+DEFAULT_PASSWORD_METHOD = 'pbkdf2:sha256:1000'
+
+# Prepared statements kept per pooled connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 512
+
+# SQLite 3.45+ can store JSON in its binary JSONB format
+JSONB_SUPPORTED = sqlite3.sqlite_version_info >= (3, 45, 0)
+
+
+def json_dumps(obj) -> str:
+    """Serialize to JSON text with orjson (NumPy scalars allowed, NaN becomes null)"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+def json_bytes(obj) -> bytes:
+    """Serialize to UTF-8 JSON bytes for a json_param() placeholder"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_loads(data):
+    """Parse JSON text or bytes with orjson"""
+    return orjson.loads(data)
+
+
+# Scan blobs cross the sqlite3 boundary as UTF-8 bytes so large payloads are
+# never materialized as Python str. They are still stored as TEXT (or JSONB),
+# because json_each/json_extract reject BLOB values.
+
+def json_param() -> str:
+    """SQL placeholder for writing json_bytes() output (stored as JSONB when supported)"""
+    return 'jsonb(CAST(? AS TEXT))' if JSONB_SUPPORTED else 'CAST(? AS TEXT)'
+
+
+def json_column(column: str) -> str:
+    """SQL select expression returning a JSON column as UTF-8 bytes"""
+    if JSONB_SUPPORTED:
+        return f'CAST(json({column}) AS BLOB) AS {column}'
+    return f'CAST({column} AS BLOB) AS {column}'
+
+
 class Database:
     """Database connection manager"""
 
@@ -23,6 +77,8 @@ class Database:
                     db_path = 'elder_trading.db'
 
         self.db_path = db_path
+        self._pool = queue.LifoQueue(maxsize=POOL_SIZE)
+        self._last_optimize = time.monotonic()
         self._ensure_directory()
         self._init_db()
 
@@ -35,15 +91,73 @@ class Database:
         except Exception as e:
             print(f"Warning: Could not create db directory: {e}")
 
-    def get_connection(self):
+    def get_connection(self, check_same_thread: bool = True):
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread,
+                               cached_statements=STATEMENT_CACHE_SIZE)
         conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA foreign_keys = ON')
+        # Per-connection tuning; WAL itself is persisted in the file (see _init_db)
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        conn.execute('PRAGMA mmap_size = 268435456')
+        conn.execute('PRAGMA cache_size = -65536')
+        # Wait for a concurrent WAL writer instead of failing with 'database is locked'
+        conn.execute('PRAGMA busy_timeout = 5000')
         return conn
 
+    def acquire_connection(self):
+        """
+        Take a connection from the pool, opening a new one if none is idle
+
+        Pooled connections may be released from a different worker thread
+        than the one that opened them, so they skip sqlite3's thread check.
+        """
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self.get_connection(check_same_thread=False)
+
+    def release_connection(self, conn):
+        """Return a connection to the pool, closing it if the pool is full"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            if time.monotonic() - self._last_optimize > OPTIMIZE_INTERVAL_SECONDS:
+                self._last_optimize = time.monotonic()
+                self._optimize(conn)
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            self._optimize(conn)
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Warning: Dropping broken database connection: {e}")
+            conn.close()
+
+    def _optimize(self, conn):
+        """Let SQLite refresh planner statistics (ANALYZE) where they have gone stale"""
+        try:
+            conn.execute('PRAGMA optimize')
+        except sqlite3.Error as e:
+            print(f"Warning: PRAGMA optimize failed: {e}")
+
+    def _enable_wal(self, conn):
+        """Switch the database to WAL so scans being saved don't block readers"""
+        try:
+            mode = conn.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+            if mode.lower() != 'wal':
+                print(f"Warning: WAL not available, journal mode is '{mode}'")
+        except Exception as e:
+            print(f"Warning: Could not enable WAL: {e}")
+
     def _init_db(self):
         """Initialize database schema"""
         conn = self.get_connection()
+        self._enable_wal(conn)
+        if conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            conn.close()
+            return
+
         conn.executescript('''
             -- Users table
             CREATE TABLE IF NOT EXISTS users (
@@ -104,6 +218,9 @@ class Database:
                 week_end DATE NOT NULL,
                 results JSON NOT NULL,
                 summary JSON,
+                bullish_results JSON,
+                status TEXT DEFAULT 'completed',
+                error TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(id)
             );
@@ -192,18 +309,65 @@ class Database:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(id)
             );
+            
+            -- Running all-time trade stats per user, kept in step with
+            -- trade_journal as entries close (built lazily on first read)
+            CREATE TABLE IF NOT EXISTS journal_stats_cache (
+                user_id INTEGER PRIMARY KEY,
+                total_trades INTEGER NOT NULL DEFAULT 0,
+                winning_trades INTEGER NOT NULL DEFAULT 0,
+                losing_trades INTEGER NOT NULL DEFAULT 0,
+                pnl_count INTEGER NOT NULL DEFAULT 0,
+                sum_pnl REAL NOT NULL DEFAULT 0,
+                best_trade REAL,
+                worst_trade REAL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id)
+            );
+            
+            -- Indexes for the lookups done by the API
+            CREATE INDEX IF NOT EXISTS idx_weekly_scans_user_market_week
+                ON weekly_scans(user_id, market, week_start, created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_daily_scans_weekly
+                ON daily_scans(weekly_scan_id);
+            CREATE INDEX IF NOT EXISTS idx_trade_setups_user_status
+                ON trade_setups(user_id, status, created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_trade_journal_user_status
+                ON trade_journal(user_id, status, created_at DESC);
+            -- Ascending so a backwards scan yields (created_at DESC, id DESC);
+            -- a DESC key breaks the rowid tie-break and adds a sort
+            CREATE INDEX IF NOT EXISTS idx_trade_journal_user_created_id
+                ON trade_journal(user_id, created_at, id);
+            CREATE INDEX IF NOT EXISTS idx_trade_journal_user_symbol
+                ON trade_journal(user_id, symbol);
+            CREATE INDEX IF NOT EXISTS idx_trade_journal_closed
+                ON trade_journal(user_id, exit_date, pnl) WHERE status = 'closed';
+            CREATE INDEX IF NOT EXISTS idx_apgar_strategy
+                ON apgar_parameters(strategy_id, display_order);
+            CREATE INDEX IF NOT EXISTS idx_strategies_user
+                ON strategies(user_id);
+            CREATE INDEX IF NOT EXISTS idx_account_settings_user
+                ON account_settings(user_id);
+            CREATE INDEX IF NOT EXISTS idx_watchlists_user_market_default
+                ON watchlists(user_id, market) WHERE is_default = 1;
         ''')
         conn.commit()
         conn.close()
 
         # Run migrations
-        self._run_migrations()
+        migrated = self._run_migrations()
 
         # Initialize default data
         self._init_defaults()
 
-    def _run_migrations(self):
-        """Run database migrations to update schema"""
+        # Later boots skip the checks above
+        if migrated:
+            conn = self.get_connection()
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.close()
+
+    def _run_migrations(self) -> bool:
+        """Run database migrations to update schema; returns False if one failed"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -220,8 +384,61 @@ class Database:
                 ''')
                 conn.commit()
                 print("Migration complete: 'summary' column added")
+
+            # Background scans record their progress on the scan row
+            if 'status' not in columns:
+                print("Migrating: Adding 'status' and 'error' columns to weekly_scans table...")
+                cursor.execute('''
+                    ALTER TABLE weekly_scans 
+                    ADD COLUMN status TEXT DEFAULT 'completed'
+                ''')
+                cursor.execute('''
+                    ALTER TABLE weekly_scans 
+                    ADD COLUMN error TEXT
+                ''')
+                conn.commit()
+                print("Migration complete: 'status' and 'error' columns added")
+
+            # Screen 1 survivors stored apart so the daily screen skips the rest
+            if 'bullish_results' not in columns:
+                print("Migrating: Adding 'bullish_results' column to weekly_scans table...")
+                cursor.execute('''
+                    ALTER TABLE weekly_scans 
+                    ADD COLUMN bullish_results JSON DEFAULT NULL
+                ''')
+                conn.commit()
+                print("Migration complete: 'bullish_results' column added")
+
+            # idx_trade_journal_user_created(user_id, created_at DESC) was
+            # replaced by idx_trade_journal_user_created_id
+            cursor.execute("DROP INDEX IF EXISTS idx_trade_journal_user_created")
+
+            # Generated columns over JSON fields so filters run in SQLite.
+            # table_xinfo is needed because table_info hides generated columns.
+            generated_columns = [
+                ('strategies', 'screen1_tf',
+                 "json_extract(config, '$.timeframes.screen1')",
+                 'idx_strategies_screen1', 'user_id, screen1_tf'),
+                ('trade_setups', 'apgar_weekly_ema',
+                 "json_extract(apgar_details, '$.weekly_ema')",
+                 'idx_trade_setups_apgar_weekly_ema', 'user_id, apgar_weekly_ema'),
+            ]
+            for table, column, expr, index, index_cols in generated_columns:
+                cursor.execute(f"PRAGMA table_xinfo({table})")
+                columns = [row[1] for row in cursor.fetchall()]
+                if column not in columns:
+                    print(f"Migrating: Adding generated '{column}' column to {table} table...")
+                    cursor.execute(f'''
+                        ALTER TABLE {table}
+                        ADD COLUMN {column} GENERATED ALWAYS AS ({expr}) VIRTUAL
+                    ''')
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON {table}({index_cols})")
+            conn.commit()
+            return True
         except Exception as e:
             print(f"Migration error: {e}")
+            return False
         finally:
             conn.close()
 
@@ -234,13 +451,16 @@ class Database:
         if cursor.fetchone()[0] == 0:
             from werkzeug.security import generate_password_hash
 
-            # Create default user
-            conn.execute('''
+            # Seed everything in one transaction
+            conn.execute('BEGIN')
+
+            # Create default user. Its password ships in the source, so a
+            # full-strength PBKDF2 run would only slow down the first boot.
+            user_id = conn.execute('''
                 INSERT INTO users (username, password_hash)
                 VALUES (?, ?)
-            ''', ('default', generate_password_hash('elder2024')))
-
-            user_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+            ''', ('default', generate_password_hash(
+                'elder2024', method=DEFAULT_PASSWORD_METHOD))).lastrowid
 
             # Create default strategy
             elder_config = {
@@ -252,15 +472,12 @@ class Database:
                 }
             }
 
-            conn.execute('''
+            strategy_id = conn.execute('''
                 INSERT INTO strategies (user_id, name, description, config)
                 VALUES (?, ?, ?, ?)
             ''', (user_id, 'Elder Triple Screen',
                   "Dr. Alexander Elder's Triple Screen Trading System",
-                  json.dumps(elder_config)))
-
-            strategy_id = conn.execute(
-                'SELECT last_insert_rowid()').fetchone()[0]
+                  json_dumps(elder_config))).lastrowid
 
             # APGAR parameters
             apgar_params = [
@@ -291,12 +508,14 @@ class Database:
                 ])
             ]
 
-            for i, (name, label, options) in enumerate(apgar_params):
-                conn.execute('''
-                    INSERT INTO apgar_parameters 
-                    (strategy_id, parameter_name, parameter_label, options, display_order)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (strategy_id, name, label, json.dumps(options), i))
+            conn.executemany('''
+                INSERT INTO apgar_parameters 
+                (strategy_id, parameter_name, parameter_label, options, display_order)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [
+                (strategy_id, name, label, json_dumps(options), i)
+                for i, (name, label, options) in enumerate(apgar_params)
+            ])
 
             # Default watchlists
             nasdaq_100 = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA',
@@ -307,28 +526,23 @@ class Database:
                         'ICICIBANK.NS', 'HINDUNILVR.NS', 'SBIN.NS', 'BHARTIARTL.NS',
                         'ITC.NS', 'KOTAKBANK.NS', 'LT.NS', 'AXISBANK.NS']
 
-            conn.execute('''
-                INSERT INTO watchlists (user_id, name, market, symbols, is_default)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, 'NASDAQ 100', 'US', json.dumps(nasdaq_100), 1))
-
-            conn.execute('''
+            conn.executemany('''
                 INSERT INTO watchlists (user_id, name, market, symbols, is_default)
                 VALUES (?, ?, ?, ?, ?)
-            ''', (user_id, 'NIFTY 50', 'IN', json.dumps(nifty_50), 1))
+            ''', [
+                (user_id, 'NASDAQ 100', 'US', json_dumps(nasdaq_100), 1),
+                (user_id, 'NIFTY 50', 'IN', json_dumps(nifty_50), 1)
+            ])
 
             # Default account settings
-            conn.execute('''
-                INSERT INTO account_settings 
-                (user_id, account_name, market, trading_capital, currency, broker)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_id, 'ISA Account', 'US', 6000, 'GBP', 'Trading212'))
-
-            conn.execute('''
+            conn.executemany('''
                 INSERT INTO account_settings 
                 (user_id, account_name, market, trading_capital, currency, broker)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', (user_id, 'Zerodha Account', 'IN', 570749, 'INR', 'Zerodha'))
+            ''', [
+                (user_id, 'ISA Account', 'US', 6000, 'GBP', 'Trading212'),
+                (user_id, 'Zerodha Account', 'IN', 570749, 'INR', 'Zerodha')
+            ])
 
             conn.commit()
 
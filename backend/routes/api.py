@@ -3,11 +3,16 @@ Elder Trading System - API Routes
 Flask Blueprint with all REST API endpoints
 """
 
-from flask import Blueprint, request, jsonify, g
-from datetime import datetime, timedelta
-import json
-
-from models.database import get_database
+from flask import Blueprint, request, jsonify, g, current_app
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from models.database import (
+    get_database, json_param, json_column, json_bytes, json_dumps, json_loads
+)
 from services.screener import run_weekly_screen, run_daily_screen, scan_stock
 from services.indicators import get_grading_criteria
 from services.indicator_config import (
@@ -21,19 +26,359 @@ from services.candlestick_patterns import CANDLESTICK_PATTERNS
 
 api = Blueprint('api', __name__, url_prefix='/api')
 
+# Column order of the strategies/apgar_parameters projection in get_strategies
+# Explicit column lists keep the generated index columns (screen1_tf,
+# apgar_weekly_ema) out of API responses
+STRATEGY_COLUMNS = ('id', 'user_id', 'name', 'description', 'is_active', 'config',
+                    'created_at')
+APGAR_COLUMNS = ('id', 'strategy_id', 'parameter_name', 'parameter_label', 'options',
+                 'display_order')
+
+# Scan queries depend on JSONB support, so build them once at import; the
+# identical strings then hit sqlite3's per-connection statement cache
+SQL_INSERT_WEEKLY_SCAN = f'''
+    INSERT INTO weekly_scans 
+    (user_id, market, scan_date, week_start, week_end, results, summary,
+     bullish_results)
+    VALUES (?, ?, ?, ?, ?, {json_param()}, {json_param()}, {json_param()})
+'''
+
+SQL_GET_WEEKLY_SCAN = '''
+    SELECT market, status FROM weekly_scans WHERE id = ?
+'''
+
+# Stocks that passed Screen 1. Scans saved before bullish_results existed
+# fall back to filtering the full results inside SQLite.
+SQL_GET_WEEKLY_BULLISH = f'''
+    SELECT {json_column('value')}
+    FROM weekly_scans,
+         json_each(COALESCE(weekly_scans.bullish_results, weekly_scans.results))
+    WHERE weekly_scans.id = ? AND json_extract(value, '$.weekly_bullish')
+    ORDER BY key
+'''
+
+SQL_INSERT_RUNNING_WEEKLY_SCAN = '''
+    INSERT INTO weekly_scans 
+    (user_id, market, scan_date, week_start, week_end, results, status)
+    VALUES (?, ?, ?, ?, ?, '[]', 'running')
+'''
+
+SQL_COMPLETE_WEEKLY_SCAN = f'''
+    UPDATE weekly_scans
+    SET results = {json_param()}, summary = {json_param()},
+        bullish_results = {json_param()}, status = 'completed'
+    WHERE id = ?
+'''
+
+SQL_FAIL_WEEKLY_SCAN = '''
+    UPDATE weekly_scans SET status = 'failed', error = ? WHERE id = ?
+'''
+
+# A scan whose worker died (restart, crash) would stay 'running' forever
+SQL_EXPIRE_WEEKLY_SCAN = '''
+    UPDATE weekly_scans
+    SET status = 'failed', error = 'Scan did not finish; the worker may have restarted'
+    WHERE id = ? AND status = 'running' AND created_at < datetime('now', ?)
+'''
+
+SQL_GET_WEEKLY_SCAN_STATUS = f'''
+    SELECT id, market, status, error, scan_date, week_start, week_end,
+           {json_column('summary')}
+    FROM weekly_scans WHERE id = ? AND user_id = ?
+'''
+
+SQL_INSERT_DAILY_SCAN = f'''
+    INSERT INTO daily_scans 
+    (user_id, weekly_scan_id, market, scan_date, results)
+    VALUES (?, ?, ?, ?, {json_param()})
+'''
+
+SQL_GET_LATEST_WEEKLY_SCAN = f'''
+    SELECT id, market, scan_date, week_start, week_end,
+           {json_column('results')}, {json_column('summary')}
+    FROM weekly_scans 
+    WHERE user_id = ? AND market = ? AND week_start = ? AND status = 'completed'
+    ORDER BY created_at DESC LIMIT 1
+'''
+
+SQL_INSERT_SETUP = '''
+    INSERT INTO trade_setups 
+    (user_id, daily_scan_id, symbol, market, strategy_id, apgar_score,
+     apgar_details, entry_price, stop_loss, target_price, position_size,
+     risk_amount, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+SQL_ACTIVATE_SETUP = '''
+    UPDATE trade_setups SET status = 'active'
+    WHERE id = ? AND user_id = ? AND status = 'pending'
+    RETURNING id, symbol, market, entry_price, position_size, stop_loss,
+              target_price, strategy_id, apgar_score
+'''
+
+SQL_INSERT_JOURNAL_FROM_SETUP = '''
+    INSERT INTO trade_journal
+    (user_id, trade_setup_id, symbol, market, entry_date, entry_price,
+     position_size, stop_loss, target_price, strategy_id, apgar_score, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'open')
+'''
+
+SQL_BUILD_JOURNAL_STATS = '''
+    INSERT INTO journal_stats_cache
+    (user_id, total_trades, winning_trades, losing_trades, pnl_count, sum_pnl,
+     best_trade, worst_trade)
+    SELECT ?, COUNT(*),
+           COALESCE(SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END), 0),
+           COALESCE(SUM(CASE WHEN pnl < 0 THEN 1 ELSE 0 END), 0),
+           COUNT(pnl), COALESCE(SUM(pnl), 0), MAX(pnl), MIN(pnl)
+    FROM trade_journal WHERE user_id = ? AND status = 'closed'
+    ON CONFLICT(user_id) DO NOTHING
+    RETURNING *
+'''
+
+SQL_JOURNAL_PNL_RANGE = '''
+    SELECT MAX(pnl), MIN(pnl) FROM trade_journal
+    WHERE user_id = ? AND status = 'closed'
+'''
+
+# Optional filters are NULL-guarded so every call shares one prepared statement.
+# The keyset bound is always bound (JOURNAL_NO_CURSOR for the first page) so it
+# stays a range seek on idx_trade_journal_user_created_id.
+JOURNAL_NO_CURSOR = '9999-12-31'
+SQL_GET_JOURNAL = '''
+    SELECT * FROM trade_journal
+    WHERE user_id = :user_id
+      AND (:status IS NULL OR status = :status)
+      AND (:watchlist_id IS NULL OR symbol IN (
+          SELECT j.value FROM watchlists w, json_each(w.symbols) j
+          WHERE w.id = :watchlist_id AND w.user_id = :user_id
+      ))
+      AND (created_at, id) < (:before, :before_id)
+    ORDER BY created_at DESC, id DESC LIMIT :limit
+'''
+
+# Unticked 7-step evening checklist, served when today has no saved row
+DEFAULT_CHECKLIST_ITEMS = {f'step{i}': False for i in range(1, 8)}
+
+# Scan results per chunk when streaming a response
+STREAM_CHUNK_ITEMS = 64
+
+# Background weekly scans (POST /screener/weekly with "async": true)
+SCAN_WORKERS = 2
+SCAN_POOL = ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix='weekly-scan')
+
+# A background scan still 'running' after this long is reported as failed
+SCAN_TIMEOUT_MINUTES = 30
+
 
 def get_db():
     """Get database connection for current request"""
     if 'db' not in g:
-        g.db = get_database().get_connection()
+        g.db = get_database().acquire_connection()
     return g.db
 
 
+def get_now() -> datetime:
+    """Local time for the current request, read once so all its dates agree"""
+    if 'now' not in g:
+        g.now = datetime.now()
+    return g.now
+
+
+def get_today() -> date:
+    """Local date for the current request"""
+    return get_now().date()
+
+
+def fetch_dicts(cursor):
+    """Fetch all rows as dicts, reading the column names once from the cursor"""
+    cols = [c[0] for c in cursor.description]
+    return [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+
+def stream_json(head: dict, key: str, items: list):
+    """
+    Stream `head` with `items` under `key` as one JSON object
+
+    Items are serialized STREAM_CHUNK_ITEMS at a time, so the full scan
+    payload is never held as one encoded buffer.
+    """
+    def generate():
+        prefix = json_bytes(head)[:-1]
+        yield prefix + (b',"' if head else b'"') + key.encode() + b'":['
+        for i in range(0, len(items), STREAM_CHUNK_ITEMS):
+            chunk = json_bytes(items[i:i + STREAM_CHUNK_ITEMS])[1:-1]
+            yield (b',' if i else b'') + chunk
+        yield b']}'
+
+    return current_app.response_class(generate(), mimetype='application/json')
+
+
+def fetch_columns(db, sql: str, params) -> dict:
+    """Fetch all rows as {'columns': [...], 'rows': [[...], ...]} without building sqlite3.Row objects"""
+    cursor = db.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    return {
+        'columns': [c[0] for c in cursor.description],
+        'rows': cursor.fetchall()
+    }
+
+
+@lru_cache(maxsize=4096)
+def parse_json_blob(blob):
+    """
+    Decode a stored JSON object column, memoized on the raw text
+
+    The result is shared between callers, so only serialize it, never mutate it.
+    """
+    return json_loads(blob) if blob else {}
+
+
 def get_user_id():
     """Get current user ID (default to 1 for now)"""
     return getattr(g, 'user_id', 1)
 
 
+def get_watchlist_symbols(db, where: str, params: tuple):
+    """
+    Expand the symbols of the first watchlist matching `where` with json_each
+
+    Returns None when no watchlist matches, otherwise the symbol list.
+    """
+    rows = db.execute(f'''
+        SELECT j.value FROM watchlists w
+        LEFT JOIN json_each(w.symbols) j
+        WHERE w.id = (SELECT id FROM watchlists WHERE {where} LIMIT 1)
+        ORDER BY j.key
+    ''', params).fetchall()
+    if not rows:
+        return None
+    return [r[0] for r in rows if r[0] is not None]
+
+
+def setup_row(user_id: int, data: dict) -> tuple:
+    """Parameters for SQL_INSERT_SETUP from a setup request body"""
+    return (
+        user_id, data.get('daily_scan_id'), data['symbol'], data['market'],
+        data.get('strategy_id', 1), data.get('apgar_score'),
+        json_dumps(data.get('apgar_details', {})),
+        data['entry_price'], data['stop_loss'], data['target_price'],
+        data.get('position_size'), data.get('risk_amount'), 'pending'
+    )
+
+
+def update_journal_stats(db, user_id: int, old: tuple, new: tuple):
+    """
+    Apply one journal entry's change to the cached all-time stats
+
+    old/new are (closed, pnl) for the entry before and after the update,
+    which must already have been executed. Best/worst are re-queried only
+    when the entry that held them changes.
+    """
+    stats = db.execute(
+        'SELECT * FROM journal_stats_cache WHERE user_id = ?', (user_id,)
+    ).fetchone()
+    if stats is None:
+        return  # not built yet, the first stats read aggregates the table
+
+    stats = dict(stats)
+    refresh_range = False
+    for sign, (closed, pnl) in ((-1, old), (1, new)):
+        if not closed:
+            continue
+        stats['total_trades'] += sign
+        if pnl is None:
+            continue
+        stats['winning_trades'] += sign * (pnl > 0)
+        stats['losing_trades'] += sign * (pnl < 0)
+        stats['pnl_count'] += sign
+        stats['sum_pnl'] += sign * pnl
+        if sign < 0:
+            refresh_range |= pnl in (stats['best_trade'], stats['worst_trade'])
+        elif not refresh_range:
+            stats['best_trade'] = pnl if stats['best_trade'] is None else max(stats['best_trade'], pnl)
+            stats['worst_trade'] = pnl if stats['worst_trade'] is None else min(stats['worst_trade'], pnl)
+
+    if refresh_range:
+        stats['best_trade'], stats['worst_trade'] = db.execute(
+            SQL_JOURNAL_PNL_RANGE, (user_id,)).fetchone()
+    if stats['pnl_count'] == 0:
+        stats['sum_pnl'] = 0  # drop accumulated rounding
+
+    db.execute('''
+        UPDATE journal_stats_cache
+        SET total_trades = ?, winning_trades = ?, losing_trades = ?, pnl_count = ?,
+            sum_pnl = ?, best_trade = ?, worst_trade = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = ?
+    ''', (
+        stats['total_trades'], stats['winning_trades'], stats['losing_trades'],
+        stats['pnl_count'], stats['sum_pnl'], stats['best_trade'],
+        stats['worst_trade'], user_id
+    ))
+
+
+def get_cached_journal_stats(db, user_id: int) -> dict:
+    """All-time stats from journal_stats_cache, building the row on first use"""
+    stats = db.execute(
+        'SELECT * FROM journal_stats_cache WHERE user_id = ?', (user_id,)
+    ).fetchone()
+    if stats is None:
+        stats = db.execute(SQL_BUILD_JOURNAL_STATS, (user_id, user_id)).fetchone()
+        db.commit()
+        if stats is None:
+            # A concurrent first read built the row between our SELECT and INSERT
+            stats = db.execute(
+                'SELECT * FROM journal_stats_cache WHERE user_id = ?', (user_id,)
+            ).fetchone()
+
+    # Same shape as the aggregate query: NULL sums/extremes with no trades
+    total = stats['total_trades']
+    pnl_count = stats['pnl_count']
+    return {
+        'total_trades': total,
+        'winning_trades': stats['winning_trades'] if total else None,
+        'losing_trades': stats['losing_trades'] if total else None,
+        'total_pnl': stats['sum_pnl'] if pnl_count else None,
+        'avg_pnl': stats['sum_pnl'] / pnl_count if pnl_count else None,
+        'best_trade': stats['best_trade'],
+        'worst_trade': stats['worst_trade'],
+        'win_rate': stats['winning_trades'] / total * 100 if total else 0
+    }
+
+
+def expire_stale_scan(db, scan_id: int):
+    """Mark the scan failed if it has been 'running' longer than SCAN_TIMEOUT_MINUTES"""
+    cursor = db.execute(
+        SQL_EXPIRE_WEEKLY_SCAN, (scan_id, f'-{SCAN_TIMEOUT_MINUTES} minutes'))
+    if cursor.rowcount:
+        db.commit()
+
+
+def bullish_results(all_results: list) -> list:
+    """Weekly results that passed Screen 1, the input to the daily screen"""
+    return [r for r in all_results if r.get('weekly_bullish')]
+
+
+def run_weekly_scan_job(scan_id: int, market: str, symbols):
+    """Run a weekly screen in the background and store it on its scan row"""
+    db = get_database().acquire_connection()
+    try:
+        results = run_weekly_screen(market, symbols)
+        db.execute(SQL_COMPLETE_WEEKLY_SCAN, (
+            json_bytes(results['all_results']),
+            json_bytes(results['summary']),
+            json_bytes(bullish_results(results['all_results'])),
+            scan_id
+        ))
+    except Exception as e:
+        print(f"Weekly scan {scan_id} failed: {e}")
+        db.execute(SQL_FAIL_WEEKLY_SCAN, (str(e), scan_id))
+    finally:
+        db.commit()
+        get_database().release_connection(db)
+
+
 # ============ HEALTH CHECK ============
 @api.route('/health', methods=['GET'])
 def health_check():
@@ -54,6 +399,8 @@ def weekly_screener():
     Request body:
         market: 'US' or 'IN'
         watchlist_id: (optional) specific watchlist to scan
+        async: (optional) run in the background and return the scan_id
+            right away; poll /screener/status/<scan_id> for completion
 
     Returns:
         Complete scan results with all stocks and indicators
@@ -61,54 +408,58 @@ def weekly_screener():
     data = request.get_json() or {}
     market = data.get('market', 'US')
     watchlist_id = data.get('watchlist_id')
+    run_async = bool(data.get('async'))
 
     db = get_db()
     user_id = get_user_id()
 
     # Get symbols from watchlist
-    symbols = None
     if watchlist_id:
-        watchlist = db.execute(
-            'SELECT symbols FROM watchlists WHERE id = ?',
-            (watchlist_id,)
-        ).fetchone()
-        if watchlist:
-            symbols = json.loads(watchlist['symbols'])
+        symbols = get_watchlist_symbols(db, 'id = ?', (watchlist_id,))
     else:
         # Get default watchlist for market
-        watchlist = db.execute('''
-            SELECT symbols FROM watchlists 
-            WHERE user_id = ? AND market = ? AND is_default = 1
-        ''', (user_id, market)).fetchone()
-        if watchlist:
-            symbols = json.loads(watchlist['symbols'])
-
-    # Run the screener
-    results = run_weekly_screen(market, symbols)
+        symbols = get_watchlist_symbols(
+            db, 'user_id = ? AND market = ? AND is_default = 1', (user_id, market))
 
     # Calculate week boundaries
-    today = datetime.now().date()
+    today = get_today()
     week_start = today - timedelta(days=today.weekday())
     week_end = week_start + timedelta(days=6)
 
+    if run_async:
+        cursor = db.execute(SQL_INSERT_RUNNING_WEEKLY_SCAN, (
+            user_id, market, today, week_start, week_end
+        ))
+        db.commit()
+        SCAN_POOL.submit(run_weekly_scan_job, cursor.lastrowid, market, symbols)
+        return jsonify({
+            'scan_id': cursor.lastrowid,
+            'status': 'running',
+            'market': market,
+            'week_start': week_start.isoformat(),
+            'week_end': week_end.isoformat()
+        }), 202
+
+    # Run the screener
+    results = run_weekly_screen(market, symbols)
+
     # Save scan to database
-    db.execute('''
-        INSERT INTO weekly_scans 
-        (user_id, market, scan_date, week_start, week_end, results, summary)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (
+    cursor = db.execute(SQL_INSERT_WEEKLY_SCAN, (
         user_id, market, today, week_start, week_end,
-        json.dumps(results['all_results']),
-        json.dumps(results['summary'])
+        json_bytes(results['all_results']),
+        json_bytes(results['summary']),
+        json_bytes(bullish_results(results['all_results']))
     ))
     db.commit()
 
-    scan_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+    scan_id = cursor.lastrowid
     results['scan_id'] = scan_id
     results['week_start'] = week_start.isoformat()
     results['week_end'] = week_end.isoformat()
 
-    return jsonify(results)
+    # all_results is the bulk of the payload, so it is streamed last
+    all_results = results.pop('all_results')
+    return stream_json(results, 'all_results', all_results)
 
 
 @api.route('/screener/daily', methods=['POST'])
@@ -132,34 +483,32 @@ def daily_screener():
     user_id = get_user_id()
 
     # Get weekly scan results
-    weekly_scan = db.execute(
-        'SELECT * FROM weekly_scans WHERE id = ?',
-        (weekly_scan_id,)
-    ).fetchone()
+    expire_stale_scan(db, weekly_scan_id)
+    weekly_scan = db.execute(SQL_GET_WEEKLY_SCAN, (weekly_scan_id,)).fetchone()
 
     if not weekly_scan:
         return jsonify({'error': 'Weekly scan not found'}), 404
+    if weekly_scan['status'] != 'completed':
+        return jsonify({'error': f"Weekly scan is {weekly_scan['status']}"}), 409
 
     # Get stocks that passed weekly screen
-    weekly_results = json.loads(weekly_scan['results'])
-    bullish_stocks = [r for r in weekly_results if r.get('weekly_bullish')]
+    bullish_stocks = [
+        json_loads(row[0])
+        for row in db.execute(SQL_GET_WEEKLY_BULLISH, (weekly_scan_id,))
+    ]
 
     # Run daily screen
     results = run_daily_screen(bullish_stocks)
 
     # Save to database
-    today = datetime.now().date()
-    db.execute('''
-        INSERT INTO daily_scans 
-        (user_id, weekly_scan_id, market, scan_date, results)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (
+    today = get_today()
+    cursor = db.execute(SQL_INSERT_DAILY_SCAN, (
         user_id, weekly_scan_id, weekly_scan['market'],
-        today, json.dumps(results['all_results'])
+        today.isoformat(), json_bytes(results['all_results'])
     ))
     db.commit()
 
-    scan_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+    scan_id = cursor.lastrowid
     results['scan_id'] = scan_id
     results['weekly_scan_id'] = weekly_scan_id
 
@@ -256,33 +605,57 @@ def get_bearish_patterns():
     return jsonify(bearish)
 
 
+@api.route('/screener/status/<int:scan_id>', methods=['GET'])
+def get_scan_status(scan_id):
+    """Get the status of a weekly scan (running, completed or failed)"""
+    db = get_db()
+    user_id = get_user_id()
+
+    expire_stale_scan(db, scan_id)
+    scan = db.execute(SQL_GET_WEEKLY_SCAN_STATUS, (scan_id, user_id)).fetchone()
+    if not scan:
+        return jsonify({'error': 'Weekly scan not found'}), 404
+
+    return jsonify({
+        'scan_id': scan['id'],
+        'status': scan['status'],
+        'error': scan['error'],
+        'market': scan['market'],
+        'scan_date': scan['scan_date'],
+        'week_start': scan['week_start'],
+        'week_end': scan['week_end'],
+        'summary': json_loads(scan['summary']) if scan['summary'] else None
+    })
+
+
 @api.route('/screener/weekly/latest', methods=['GET'])
 def get_latest_weekly():
     """Get latest weekly scan for current week"""
     market = request.args.get('market', 'US')
 
-    today = datetime.now().date()
+    today = get_today()
     week_start = today - timedelta(days=today.weekday())
 
     db = get_db()
     user_id = get_user_id()
 
-    scan = db.execute('''
-        SELECT * FROM weekly_scans 
-        WHERE user_id = ? AND market = ? AND week_start = ?
-        ORDER BY created_at DESC LIMIT 1
-    ''', (user_id, market, week_start)).fetchone()
+    scan = db.execute(SQL_GET_LATEST_WEEKLY_SCAN,
+                      (user_id, market, week_start)).fetchone()
 
     if scan:
-        return jsonify({
+        # Stored results are already JSON bytes; splice them in undecoded
+        head = json_bytes({
             'scan_id': scan['id'],
             'market': scan['market'],
             'scan_date': scan['scan_date'],
             'week_start': scan['week_start'],
             'week_end': scan['week_end'],
-            'results': json.loads(scan['results']),
-            'summary': json.loads(scan['summary']) if scan['summary'] else None
+            'summary': json_loads(scan['summary']) if scan['summary'] else None
         })
+        return current_app.response_class(
+            head[:-1] + b',"results":' + scan['results'] + b'}',
+            mimetype='application/json'
+        )
 
     return jsonify({'message': 'No weekly scan found for current week'}), 404
 
@@ -304,12 +677,12 @@ def get_settings():
     db = get_db()
     user_id = get_user_id()
 
-    settings = db.execute(
+    settings = fetch_dicts(db.execute(
         'SELECT * FROM account_settings WHERE user_id = ?',
         (user_id,)
-    ).fetchall()
+    ))
 
-    return jsonify([dict(s) for s in settings])
+    return jsonify(settings)
 
 
 @api.route('/settings', methods=['POST'])
@@ -319,7 +692,7 @@ def create_setting():
     db = get_db()
     user_id = get_user_id()
 
-    db.execute('''
+    cursor = db.execute('''
         INSERT INTO account_settings 
         (user_id, account_name, market, trading_capital, risk_per_trade,
          max_monthly_drawdown, target_rr, max_open_positions, currency, broker)
@@ -332,7 +705,7 @@ def create_setting():
     ))
     db.commit()
 
-    return jsonify({'message': 'Setting created', 'id': db.execute('SELECT last_insert_rowid()').fetchone()[0]})
+    return jsonify({'message': 'Setting created', 'id': cursor.lastrowid})
 
 
 @api.route('/settings/<int:id>', methods=['PUT'])
@@ -361,28 +734,49 @@ def update_setting(id):
 # ============ STRATEGIES ============
 @api.route('/strategies', methods=['GET'])
 def get_strategies():
-    """Get all strategies with APGAR parameters"""
+    """
+    Get all strategies with APGAR parameters
+
+    Query params:
+        screen1: (optional) only strategies whose Screen 1 timeframe matches
+    """
+    screen1 = request.args.get('screen1')
+
     db = get_db()
     user_id = get_user_id()
 
-    strategies = db.execute(
-        'SELECT * FROM strategies WHERE user_id = ?',
-        (user_id,)
-    ).fetchall()
-
+    where = 'WHERE s.user_id = ?'
+    params = [user_id]
+    if screen1:
+        where += ' AND s.screen1_tf = ?'
+        params.append(screen1)
+
+    # One JOIN instead of a parameter query per strategy
+    rows = db.execute(f'''
+        SELECT s.id, s.user_id, s.name, s.description, s.is_active, s.config,
+               s.created_at,
+               p.id, p.strategy_id, p.parameter_name, p.parameter_label,
+               p.options, p.display_order
+        FROM strategies s
+        LEFT JOIN apgar_parameters p ON p.strategy_id = s.id
+        {where}
+        ORDER BY s.id, p.display_order, p.id
+    ''', params).fetchall()
+
+    split = len(STRATEGY_COLUMNS)
     result = []
-    for s in strategies:
-        strategy = dict(s)
-        strategy['config'] = json.loads(strategy['config'])
-
-        params = db.execute('''
-            SELECT * FROM apgar_parameters 
-            WHERE strategy_id = ? ORDER BY display_order
-        ''', (s['id'],)).fetchall()
-
-        strategy['apgar_parameters'] = [
-            {**dict(p), 'options': json.loads(p['options'])} for p in params
-        ]
+    for _, group in groupby(rows, key=lambda r: r[0]):
+        group = list(group)
+        strategy = dict(zip(STRATEGY_COLUMNS, group[0][:split]))
+        strategy['config'] = json_loads(strategy['config'])
+
+        strategy['apgar_parameters'] = []
+        for r in group:
+            if r[split] is None:  # strategy without parameters
+                continue
+            param = dict(zip(APGAR_COLUMNS, r[split:]))
+            param['options'] = json_loads(param['options'])
+            strategy['apgar_parameters'].append(param)
         result.append(strategy)
 
     return jsonify(result)
@@ -395,14 +789,14 @@ def get_watchlists():
     db = get_db()
     user_id = get_user_id()
 
-    watchlists = db.execute(
+    watchlists = fetch_dicts(db.execute(
         'SELECT * FROM watchlists WHERE user_id = ?',
         (user_id,)
-    ).fetchall()
+    ))
 
-    return jsonify([
-        {**dict(w), 'symbols': json.loads(w['symbols'])} for w in watchlists
-    ])
+    for w in watchlists:
+        w['symbols'] = json_loads(w['symbols'])
+    return jsonify(watchlists)
 
 
 @api.route('/watchlists', methods=['POST'])
@@ -415,7 +809,7 @@ def create_watchlist():
     db.execute('''
         INSERT INTO watchlists (user_id, name, market, symbols, is_default)
         VALUES (?, ?, ?, ?, ?)
-    ''', (user_id, data['name'], data['market'], json.dumps(data['symbols']), 0))
+    ''', (user_id, data['name'], data['market'], json_dumps(data['symbols']), 0))
     db.commit()
 
     return jsonify({'message': 'Watchlist created'})
@@ -429,18 +823,20 @@ def get_setups():
     db = get_db()
     user_id = get_user_id()
 
-    setups = db.execute('''
-        SELECT ts.*, s.name as strategy_name 
+    setups = fetch_dicts(db.execute('''
+        SELECT ts.id, ts.user_id, ts.daily_scan_id, ts.symbol, ts.market,
+               ts.strategy_id, ts.apgar_score, ts.apgar_details, ts.entry_price,
+               ts.stop_loss, ts.target_price, ts.position_size, ts.risk_amount,
+               ts.status, ts.created_at, s.name as strategy_name
         FROM trade_setups ts
         LEFT JOIN strategies s ON ts.strategy_id = s.id
         WHERE ts.user_id = ? AND ts.status = ?
         ORDER BY ts.created_at DESC
-    ''', (user_id, status)).fetchall()
+    ''', (user_id, status)))
 
-    return jsonify([
-        {**dict(s), 'apgar_details': json.loads(s['apgar_details'] or '{}')}
-        for s in setups
-    ])
+    for s in setups:
+        s['apgar_details'] = parse_json_blob(s['apgar_details'])
+    return jsonify(setups)
 
 
 @api.route('/setups', methods=['POST'])
@@ -450,48 +846,109 @@ def create_setup():
     db = get_db()
     user_id = get_user_id()
 
-    db.execute('''
-        INSERT INTO trade_setups 
-        (user_id, daily_scan_id, symbol, market, strategy_id, apgar_score,
-         apgar_details, entry_price, stop_loss, target_price, position_size,
-         risk_amount, status)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        user_id, data.get('daily_scan_id'), data['symbol'], data['market'],
-        data.get('strategy_id', 1), data.get('apgar_score'),
-        json.dumps(data.get('apgar_details', {})),
-        data['entry_price'], data['stop_loss'], data['target_price'],
-        data.get('position_size'), data.get('risk_amount'), 'pending'
+    cursor = db.execute(SQL_INSERT_SETUP, setup_row(user_id, data))
+    db.commit()
+
+    return jsonify({'message': 'Setup created', 'id': cursor.lastrowid})
+
+
+@api.route('/setups/bulk', methods=['POST'])
+def create_setups_bulk():
+    """
+    Create several trade setups in one transaction
+
+    Request body:
+        List of setups, each with the same fields as POST /setups
+    """
+    data = request.get_json()
+    if not isinstance(data, list):
+        return jsonify({'error': 'Expected a list of setups'}), 400
+
+    user_id = get_user_id()
+    rows = []
+    for index, setup in enumerate(data):
+        if not isinstance(setup, dict):
+            return jsonify({'error': f'Setup {index} is not an object'}), 400
+        try:
+            rows.append(setup_row(user_id, setup))
+        except KeyError as e:
+            return jsonify({'error': f'Missing field {e} in setup {index}'}), 400
+
+    db = get_db()
+    db.execute('BEGIN')
+    db.executemany(SQL_INSERT_SETUP, rows)
+    db.commit()
+
+    return jsonify({'message': 'Setups created', 'count': len(rows)})
+
+
+@api.route('/setups/<int:id>/activate', methods=['POST'])
+def activate_setup(id):
+    """Mark a pending setup active and open a journal entry from it"""
+    db = get_db()
+    user_id = get_user_id()
+
+    # UPDATE ... RETURNING reads the setup and flips its status in one statement
+    setup = db.execute(SQL_ACTIVATE_SETUP, (id, user_id)).fetchone()
+    if not setup:
+        db.rollback()
+        return jsonify({'error': 'Pending setup not found'}), 404
+
+    setup_id, symbol, market, *levels = setup
+    cursor = db.execute(SQL_INSERT_JOURNAL_FROM_SETUP, (
+        user_id, setup_id, symbol, market, get_today().isoformat(), *levels
     ))
     db.commit()
 
-    return jsonify({'message': 'Setup created', 'id': db.execute('SELECT last_insert_rowid()').fetchone()[0]})
+    return jsonify({'message': 'Setup activated', 'journal_id': cursor.lastrowid})
 
 
 # ============ TRADE JOURNAL ============
 @api.route('/journal', methods=['GET'])
 def get_journal():
-    """Get trade journal entries"""
+    """
+    Get trade journal entries
+
+    Query params:
+        status: (optional) 'open' or 'closed'
+        watchlist_id: (optional) only trades in symbols of this watchlist
+        limit: max entries (default 50)
+        before, before_id: (optional) keyset cursor, the created_at and id of
+            the last entry already seen; a full page sets X-Next-Before and
+            X-Next-Before-Id for the next request
+        format: (optional) 'columns' returns {columns, rows} instead of a list of objects
+    """
     status = request.args.get('status')
+    watchlist_id = request.args.get('watchlist_id', type=int)
     limit = request.args.get('limit', 50, type=int)
+    if limit < 1:
+        return jsonify({'error': 'limit must be at least 1'}), 400
 
     db = get_db()
     user_id = get_user_id()
 
-    if status:
-        entries = db.execute('''
-            SELECT * FROM trade_journal
-            WHERE user_id = ? AND status = ?
-            ORDER BY created_at DESC LIMIT ?
-        ''', (user_id, status, limit)).fetchall()
+    params = {
+        'user_id': user_id,
+        'status': status or None,
+        'watchlist_id': watchlist_id or None,
+        'before': request.args.get('before') or JOURNAL_NO_CURSOR,
+        'before_id': request.args.get('before_id', -1, type=int),
+        'limit': limit
+    }
+    if request.args.get('format') == 'columns':
+        result = fetch_columns(db, SQL_GET_JOURNAL, params)
+        columns = result['columns']
+        last = (dict(zip(columns, result['rows'][-1]))
+                if len(result['rows']) == limit else None)
     else:
-        entries = db.execute('''
-            SELECT * FROM trade_journal
-            WHERE user_id = ?
-            ORDER BY created_at DESC LIMIT ?
-        ''', (user_id, limit)).fetchall()
+        result = fetch_dicts(db.execute(SQL_GET_JOURNAL, params))
+        last = result[-1] if len(result) == limit else None
 
-    return jsonify([dict(e) for e in entries])
+    response = jsonify(result)
+    if last:
+        response.headers['X-Next-Before'] = last['created_at']
+        response.headers['X-Next-Before-Id'] = str(last['id'])
+    return response
 
 
 @api.route('/journal', methods=['POST'])
@@ -501,7 +958,7 @@ def create_journal_entry():
     db = get_db()
     user_id = get_user_id()
 
-    db.execute('''
+    cursor = db.execute('''
         INSERT INTO trade_journal 
         (user_id, symbol, market, direction, entry_date, entry_price,
          position_size, stop_loss, target_price, strategy_id, apgar_score,
@@ -515,7 +972,7 @@ def create_journal_entry():
     ))
     db.commit()
 
-    return jsonify({'message': 'Entry created', 'id': db.execute('SELECT last_insert_rowid()').fetchone()[0]})
+    return jsonify({'message': 'Entry created', 'id': cursor.lastrowid})
 
 
 @api.route('/journal/<int:id>', methods=['PUT'])
@@ -557,11 +1014,100 @@ def update_journal_entry(id):
         data.get('fees', 0), data.get('notes'), data.get('lessons_learned'),
         data.get('grade'), data.get('status', entry['status']), id, user_id
     ))
+    update_journal_stats(
+        db, user_id,
+        (entry['status'] == 'closed', entry['pnl']),
+        (data.get('status', entry['status']) == 'closed', pnl)
+    )
     db.commit()
 
     return jsonify({'message': 'Entry updated', 'pnl': pnl, 'pnl_percent': pnl_percent})
 
 
+@api.route('/journal/bulk_close', methods=['POST'])
+def bulk_close_journal_entries():
+    """
+    Close several journal entries in one transaction
+
+    Request body:
+        List of {id, exit_price, fees?, exit_date?, notes?, lessons_learned?, grade?}
+
+    P&L uses the same formula as update_journal_entry, vectorized over
+    the batch. Every entry must exist and still be open, or nothing is
+    closed. pnl_percent is null for entries with no cost basis.
+    """
+    data = request.get_json()
+    if not isinstance(data, list) or not data:
+        return jsonify({'error': 'Expected a list of entries'}), 400
+    try:
+        ids = [int(item['id']) for item in data]
+        exit_price = np.array([item['exit_price'] for item in data], dtype=float)
+        fees = np.array([item.get('fees') or 0 for item in data], dtype=float)
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        return jsonify({'error': f'Invalid entry: {e}'}), 400
+    # float() turns null into NaN and accepts 'inf', so check explicitly
+    invalid = np.flatnonzero(~(np.isfinite(exit_price) & np.isfinite(fees)))
+    if invalid.size:
+        return jsonify({
+            'error': 'exit_price and fees must be finite numbers',
+            'indexes': invalid.tolist()
+        }), 400
+    if len(set(ids)) != len(ids):
+        return jsonify({'error': 'Duplicate entry id'}), 400
+
+    db = get_db()
+    user_id = get_user_id()
+
+    placeholders = ','.join('?' * len(ids))
+    rows = db.execute(f'''
+        SELECT id, status = 'closed', direction = 'SHORT', entry_price, position_size
+        FROM trade_journal WHERE user_id = ? AND id IN ({placeholders})
+    ''', (user_id, *ids)).fetchall()
+    found = {row[0]: row[1:] for row in rows}
+    missing = [i for i in ids if i not in found]
+    if missing:
+        return jsonify({'error': 'Entries not found', 'ids': missing}), 404
+    closed = [i for i in ids if found[i][0]]
+    if closed:
+        return jsonify({'error': 'Entries already closed', 'ids': closed}), 409
+
+    _, short, entry_price, size = np.array([found[i] for i in ids], dtype=float).T
+    sign = np.where(short == 1, -1.0, 1.0)
+    pnl = sign * (exit_price - entry_price) * size - fees
+    cost = entry_price * size
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pnl_percent = pnl / cost * 100
+    pnl_percent = [pp if c else None for pp, c in zip(pnl_percent.tolist(), cost.tolist())]
+
+    db.execute('BEGIN')
+    db.executemany('''
+        UPDATE trade_journal
+        SET exit_date = ?, exit_price = ?, pnl = ?, pnl_percent = ?,
+            fees = ?, notes = COALESCE(?, notes),
+            lessons_learned = COALESCE(?, lessons_learned),
+            grade = COALESCE(?, grade), status = 'closed',
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ? AND user_id = ?
+    ''', [
+        (item.get('exit_date'), x, p, pp, f,
+         item.get('notes'), item.get('lessons_learned'), item.get('grade'),
+         i, user_id)
+        for item, i, x, p, pp, f in zip(
+            data, ids, exit_price.tolist(), pnl.tolist(), pnl_percent, fees.tolist())
+    ])
+    # The next stats read rebuilds the all-time row in one aggregate
+    db.execute('DELETE FROM journal_stats_cache WHERE user_id = ?', (user_id,))
+    db.commit()
+
+    return jsonify({
+        'message': 'Entries closed',
+        'results': [
+            {'id': i, 'pnl': p, 'pnl_percent': pp}
+            for i, p, pp in zip(ids, pnl.tolist(), pnl_percent)
+        ]
+    })
+
+
 @api.route('/journal/stats', methods=['GET'])
 def get_journal_stats():
     """Get trading statistics"""
@@ -570,13 +1116,17 @@ def get_journal_stats():
     db = get_db()
     user_id = get_user_id()
 
-    where = 'WHERE user_id = ? AND status = ?'
-    params = [user_id, 'closed']
+    if period not in ('month', 'year'):
+        return jsonify(get_cached_journal_stats(db, user_id))
+
+    # status is inlined (not bound) so the partial closed-trades index applies
+    where = "WHERE user_id = ? AND status = 'closed'"
+    params = [user_id]
 
     if period == 'month':
-        where += ' AND exit_date >= date("now", "-30 days")'
-    elif period == 'year':
-        where += ' AND exit_date >= date("now", "-365 days")'
+        where += " AND exit_date >= date('now', '-30 days')"
+    else:
+        where += " AND exit_date >= date('now', '-365 days')"
 
     stats = db.execute(f'''
         SELECT 
@@ -599,30 +1149,80 @@ def get_journal_stats():
     return jsonify(result)
 
 
+@api.route('/journal/stats/detailed', methods=['GET'])
+def get_journal_stats_detailed():
+    """
+    Equity-curve statistics over all closed trades in exit order
+
+    P&L is recomputed from prices with the same formula as
+    update_journal_entry, vectorized over the whole history.
+    """
+    db = get_db()
+    user_id = get_user_id()
+
+    rows = db.execute('''
+        SELECT direction = 'SHORT', entry_price, exit_price, position_size,
+               COALESCE(fees, 0)
+        FROM trade_journal
+        WHERE user_id = ? AND status = 'closed'
+          AND entry_price IS NOT NULL AND exit_price IS NOT NULL
+          AND position_size IS NOT NULL
+        ORDER BY exit_date, id
+    ''', (user_id,)).fetchall()
+
+    if not rows:
+        return jsonify({'total_trades': 0})
+
+    short, entry, exit_, size, fees = np.array(rows, dtype=float).T
+    sign = np.where(short == 1, -1.0, 1.0)
+    pnl = sign * (exit_ - entry) * size - fees
+    cost = entry * size
+    returns = np.divide(pnl, cost, out=np.zeros_like(pnl), where=cost != 0)
+
+    equity = np.cumsum(pnl)
+    drawdown = np.maximum.accumulate(np.maximum(equity, 0)) - equity
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    gross_loss = -losses.sum()
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+
+    return jsonify({
+        'total_trades': len(pnl),
+        'winning_trades': len(wins),
+        'losing_trades': len(losses),
+        'total_pnl': float(equity[-1]),
+        'avg_win': float(wins.mean()) if len(wins) else None,
+        'avg_loss': float(losses.mean()) if len(losses) else None,
+        'profit_factor': float(wins.sum() / gross_loss) if gross_loss else None,
+        'expectancy': float(pnl.mean()),
+        'max_drawdown': float(drawdown.max()),
+        'sharpe_per_trade': float(returns.mean() / std) if std else None
+    })
+
+
 # ============ CHECKLIST ============
 @api.route('/checklist', methods=['GET'])
 def get_checklist():
     """Get today's checklist"""
-    today = datetime.now().date()
+    today = get_today()
     db = get_db()
     user_id = get_user_id()
 
     checklist = db.execute('''
         SELECT * FROM daily_checklist 
         WHERE user_id = ? AND checklist_date = ?
-    ''', (user_id, today)).fetchone()
+    ''', (user_id, today.isoformat())).fetchone()
 
     if checklist:
         return jsonify({
             'date': checklist['checklist_date'],
-            'items': json.loads(checklist['items']),
+            'items': parse_json_blob(checklist['items']),
             'completed': checklist['completed_at'] is not None
         })
 
-    default_items = {f'step{i}': False for i in range(1, 8)}
     return jsonify({
         'date': today.isoformat(),
-        'items': default_items,
+        'items': DEFAULT_CHECKLIST_ITEMS,
         'completed': False
     })
 
@@ -631,18 +1231,22 @@ def get_checklist():
 def update_checklist():
     """Update checklist"""
     data = request.get_json()
-    today = datetime.now().date()
+    today = get_today()
     db = get_db()
     user_id = get_user_id()
 
     all_done = all(data['items'].values())
-    completed_at = datetime.now() if all_done else None
+    # Bound as text in the same format sqlite3's datetime adapter wrote
+    completed_at = get_now().isoformat(' ') if all_done else None
 
     db.execute('''
-        INSERT OR REPLACE INTO daily_checklist 
+        INSERT INTO daily_checklist 
         (user_id, checklist_date, items, completed_at)
         VALUES (?, ?, ?, ?)
-    ''', (user_id, today, json.dumps(data['items']), completed_at))
+        ON CONFLICT(user_id, checklist_date) DO UPDATE SET
+            items = excluded.items,
+            completed_at = excluded.completed_at
+    ''', (user_id, today.isoformat(), json_dumps(data['items']), completed_at))
     db.commit()
 
     return jsonify({'message': 'Checklist updated', 'completed': all_done})
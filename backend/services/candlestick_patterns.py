@@ -248,219 +248,152 @@ CANDLESTICK_PATTERNS = {
 }
 
 
+# Struct-of-arrays view of CANDLESTICK_PATTERNS, indexed by pattern id (dict order)
+PATTERN_KEYS = tuple(CANDLESTICK_PATTERNS)
+PATTERN_INDEX = {key: i for i, key in enumerate(PATTERN_KEYS)}
+N_PATTERNS = len(PATTERN_KEYS)
+PATTERN_TYPES = ('bullish_reversal', 'bullish_continuation',
+                 'bearish_reversal', 'bearish_continuation', 'neutral')
+PATTERN_TYPE = np.array(
+    [PATTERN_TYPES.index(p['type']) for p in CANDLESTICK_PATTERNS.values()], dtype=np.int8)
+PATTERN_RELIABILITY = np.array(
+    [p['reliability'] for p in CANDLESTICK_PATTERNS.values()], dtype=np.int8)
+PATTERN_CANDLES = np.array(
+    [p['candles'] for p in CANDLESTICK_PATTERNS.values()], dtype=np.int8)
+MAX_PATTERN_CANDLES = int(PATTERN_CANDLES.max())
+
+# Direction masks over pattern ids, and the signed reliability that
+# get_pattern_score adds per matched pattern (+ bullish, - bearish, 0 neutral)
+BULLISH_MASK = np.array(['bullish' in p['type'] for p in CANDLESTICK_PATTERNS.values()])
+BEARISH_MASK = np.array(['bearish' in p['type'] for p in CANDLESTICK_PATTERNS.values()])
+PATTERN_WEIGHT = (BULLISH_MASK.astype(np.int16) - BEARISH_MASK) * PATTERN_RELIABILITY
+
+# scan_patterns result per pattern id, built once and shared between scans;
+# callers only read and serialize them
+PATTERN_RECORDS = tuple({"pattern": key, **CANDLESTICK_PATTERNS[key]} for key in PATTERN_KEYS)
+
+# One bit per pattern id for packed per-bar masks (24 patterns fit a uint32)
+PATTERN_BITS = np.left_shift(np.uint32(1), np.arange(N_PATTERNS, dtype=np.uint32))
+BULLISH_BITS = np.bitwise_or.reduce(PATTERN_BITS[BULLISH_MASK])
+BEARISH_BITS = np.bitwise_or.reduce(PATTERN_BITS[BEARISH_MASK])
+
+
 # ============================================================
-# PATTERN DETECTION FUNCTIONS
+# PATTERN DETECTION (vectorized over OHLC arrays)
 # ============================================================
 
-def _body_size(open_price, close_price):
-    """Calculate candle body size"""
-    return abs(close_price - open_price)
-
-def _is_bullish(open_price, close_price):
-    """Check if candle is bullish (green)"""
-    return close_price > open_price
-
-def _is_bearish(open_price, close_price):
-    """Check if candle is bearish (red)"""
-    return close_price < open_price
-
-def _upper_shadow(high, open_price, close_price):
-    """Calculate upper shadow length"""
-    return high - max(open_price, close_price)
-
-def _lower_shadow(low, open_price, close_price):
-    """Calculate lower shadow length"""
-    return min(open_price, close_price) - low
-
-def _is_doji(open_price, close_price, high, low, threshold=0.1):
-    """Check if candle is a doji (body < threshold of range)"""
-    body = _body_size(open_price, close_price)
-    range_size = high - low
-    if range_size == 0:
-        return True
-    return body / range_size < threshold
-
-
-def detect_hammer(row, prev_rows, trend):
-    """Detect Hammer pattern"""
-    o, h, l, c = row['Open'], row['High'], row['Low'], row['Close']
-    body = _body_size(o, c)
-    lower_shadow = _lower_shadow(l, o, c)
-    upper_shadow = _upper_shadow(h, o, c)
-    range_size = h - l
-    
-    if range_size == 0:
-        return False
-    
-    # Hammer: small body at top, long lower shadow
-    body_ratio = body / range_size
-    lower_ratio = lower_shadow / range_size
-    
-    return (body_ratio < 0.3 and 
-            lower_ratio > 0.6 and 
-            upper_shadow < body and
-            trend == 'down')
-
-
-def detect_shooting_star(row, prev_rows, trend):
-    """Detect Shooting Star pattern"""
-    o, h, l, c = row['Open'], row['High'], row['Low'], row['Close']
-    body = _body_size(o, c)
-    upper_shadow = _upper_shadow(h, o, c)
-    lower_shadow = _lower_shadow(l, o, c)
-    range_size = h - l
-    
-    if range_size == 0:
-        return False
-    
-    body_ratio = body / range_size
-    upper_ratio = upper_shadow / range_size
-    
-    return (body_ratio < 0.3 and 
-            upper_ratio > 0.6 and 
-            lower_shadow < body and
-            trend == 'up')
+# Trend codes accepted by detect_all
+TREND_CODES = {'up': 1, 'down': -1, 'neutral': 0}
+TREND_LOOKBACK = 10
 
+# Bars per detect_all call in scan_patterns_bulk
+SCAN_BLOCK = 4096
 
-def detect_doji(row, prev_rows, trend):
-    """Detect Doji pattern"""
-    return _is_doji(row['Open'], row['Close'], row['High'], row['Low'])
 
+def _prev(values: np.ndarray, k: int) -> np.ndarray:
+    """Values k bars back; the first k bars have no history and are NaN"""
+    out = np.full(len(values), np.nan)
+    out[k:] = values[:len(values) - k]
+    return out
 
-def detect_bullish_engulfing(row, prev_row, trend):
-    """Detect Bullish Engulfing pattern"""
-    if prev_row is None:
-        return False
-    
-    prev_o, prev_c = prev_row['Open'], prev_row['Close']
-    curr_o, curr_c = row['Open'], row['Close']
-    
-    # Previous candle is bearish, current is bullish
-    # Current body engulfs previous body
-    return (_is_bearish(prev_o, prev_c) and 
-            _is_bullish(curr_o, curr_c) and
-            curr_o < prev_c and  # Opens below prev close
-            curr_c > prev_o and  # Closes above prev open
-            trend == 'down')
-
-
-def detect_bearish_engulfing(row, prev_row, trend):
-    """Detect Bearish Engulfing pattern"""
-    if prev_row is None:
-        return False
-    
-    prev_o, prev_c = prev_row['Open'], prev_row['Close']
-    curr_o, curr_c = row['Open'], row['Close']
-    
-    return (_is_bullish(prev_o, prev_c) and 
-            _is_bearish(curr_o, curr_c) and
-            curr_o > prev_c and 
-            curr_c < prev_o and
-            trend == 'up')
 
+def trend_codes(closes: np.ndarray, lookback: int = TREND_LOOKBACK) -> np.ndarray:
+    """
+    determine_trend for every bar at once: 1 up, -1 down, 0 neutral
 
-def detect_morning_star(rows, trend):
-    """Detect Morning Star pattern (3 candles)"""
-    if len(rows) < 3:
-        return False
-    
-    first, second, third = rows.iloc[-3], rows.iloc[-2], rows.iloc[-1]
-    
-    # First: large bearish
-    first_bearish = _is_bearish(first['Open'], first['Close'])
-    first_large = _body_size(first['Open'], first['Close']) > (first['High'] - first['Low']) * 0.5
-    
-    # Second: small body (star)
-    second_small = _body_size(second['Open'], second['Close']) < (second['High'] - second['Low']) * 0.3
-    
-    # Third: large bullish, closes above midpoint of first
-    third_bullish = _is_bullish(third['Open'], third['Close'])
-    first_midpoint = (first['Open'] + first['Close']) / 2
-    third_above_mid = third['Close'] > first_midpoint
-    
-    return (first_bearish and first_large and 
-            second_small and 
-            third_bullish and third_above_mid and
-            trend == 'down')
+    Bars with fewer than `lookback` closes of history are neutral.
+    """
+    codes = np.zeros(len(closes), dtype=np.int8)
+    if len(closes) < lookback:
+        return codes
+
+    # Rolling NaN-skipping mean from running sums: O(1) per bar whatever
+    # the lookback
+    valid = ~np.isnan(closes)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, closes, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sma = (sums[lookback:] - sums[:-lookback]) / (counts[lookback:] - counts[:-lookback])
+    current = closes[lookback - 1:]
+    codes[lookback - 1:] = np.where(current > sma * 1.02, 1,
+                                    np.where(current < sma * 0.98, -1, 0))
+    return codes
+
+
+def detect_all(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray,
+               trend=None) -> np.ndarray:
+    """
+    Detect every supported pattern on every bar
 
+    Args:
+        o, h, l, c: OHLC float arrays
+        trend: Trend code per bar (or one code for all bars), see TREND_CODES;
+            defaults to trend_codes(c)
 
-def detect_evening_star(rows, trend):
-    """Detect Evening Star pattern (3 candles)"""
-    if len(rows) < 3:
-        return False
-    
-    first, second, third = rows.iloc[-3], rows.iloc[-2], rows.iloc[-1]
-    
-    first_bullish = _is_bullish(first['Open'], first['Close'])
-    first_large = _body_size(first['Open'], first['Close']) > (first['High'] - first['Low']) * 0.5
-    second_small = _body_size(second['Open'], second['Close']) < (second['High'] - second['Low']) * 0.3
-    third_bearish = _is_bearish(third['Open'], third['Close'])
-    first_midpoint = (first['Open'] + first['Close']) / 2
-    third_below_mid = third['Close'] < first_midpoint
-    
-    return (first_bullish and first_large and 
-            second_small and 
-            third_bearish and third_below_mid and
-            trend == 'up')
+    Returns:
+        Boolean matrix of shape (n_bars, N_PATTERNS), columns indexed by pattern id.
+        Patterns without a detector stay False.
+    """
+    if trend is None:
+        trend = trend_codes(c)
+    trend = np.asarray(trend)
+    up, down = trend == 1, trend == -1
 
+    out = np.zeros((len(c), N_PATTERNS), dtype=bool)
 
-def detect_three_white_soldiers(rows, trend):
-    """Detect Three White Soldiers pattern"""
-    if len(rows) < 3:
-        return False
-    
-    candles = rows.iloc[-3:]
-    
-    for i in range(3):
-        if not _is_bullish(candles.iloc[i]['Open'], candles.iloc[i]['Close']):
-            return False
-        # Each candle should be large
-        body = _body_size(candles.iloc[i]['Open'], candles.iloc[i]['Close'])
-        range_size = candles.iloc[i]['High'] - candles.iloc[i]['Low']
-        if range_size > 0 and body / range_size < 0.6:
-            return False
-    
-    # Each should close higher than previous
-    return (candles.iloc[1]['Close'] > candles.iloc[0]['Close'] and
-            candles.iloc[2]['Close'] > candles.iloc[1]['Close'])
+    body = np.abs(c - o)
+    rng = h - l
+    upper = h - np.maximum(o, c)
+    lower = np.minimum(o, c) - l
+    bullish = c > o
+    bearish = c < o
 
+    # Previous bar (p1) and the bar before it (p2)
+    o1, h1, l1, c1 = _prev(o, 1), _prev(h, 1), _prev(l, 1), _prev(c, 1)
+    o2, h2, l2, c2 = _prev(o, 2), _prev(h, 2), _prev(l, 2), _prev(c, 2)
+    body1, body2 = np.abs(c1 - o1), np.abs(c2 - o2)
+    rng1, rng2 = h1 - l1, h2 - l2
 
-def detect_three_black_crows(rows, trend):
-    """Detect Three Black Crows pattern"""
-    if len(rows) < 3:
-        return False
-    
-    candles = rows.iloc[-3:]
-    
-    for i in range(3):
-        if not _is_bearish(candles.iloc[i]['Open'], candles.iloc[i]['Close']):
-            return False
-        body = _body_size(candles.iloc[i]['Open'], candles.iloc[i]['Close'])
-        range_size = candles.iloc[i]['High'] - candles.iloc[i]['Low']
-        if range_size > 0 and body / range_size < 0.6:
-            return False
-    
-    return (candles.iloc[1]['Close'] < candles.iloc[0]['Close'] and
-            candles.iloc[2]['Close'] < candles.iloc[1]['Close'])
+    # Ratio thresholds are tested as body < rng * k rather than dividing by
+    # the range; on a positive range the two are the same test
 
+    # Single candle patterns
+    out[:, PATTERN_INDEX['HAMMER']] = (
+        (rng > 0) & (body < rng * 0.3) & (lower > rng * 0.6) & (upper < body) & down)
+    out[:, PATTERN_INDEX['SHOOTING_STAR']] = (
+        (rng > 0) & (body < rng * 0.3) & (upper > rng * 0.6) & (lower < body) & up)
+    # A zero (or inverted High < Low) range counts as a doji
+    out[:, PATTERN_INDEX['DOJI']] = (rng <= 0) | (body < rng * 0.1)
+    out[:, PATTERN_INDEX['BULLISH_MARUBOZU']] = (
+        (rng > 0) & bullish & (body > rng * 0.9)
+        & (upper < body * 0.05) & (lower < body * 0.05))
+
+    # Two candle patterns: current body engulfs previous body
+    out[:, PATTERN_INDEX['BULLISH_ENGULFING']] = (
+        (c1 < o1) & bullish & (o < c1) & (c > o1) & down)
+    out[:, PATTERN_INDEX['BEARISH_ENGULFING']] = (
+        (c1 > o1) & bearish & (o > c1) & (c < o1) & up)
 
-def detect_bullish_marubozu(row, prev_rows, trend):
-    """Detect Bullish Marubozu"""
-    o, h, l, c = row['Open'], row['High'], row['Low'], row['Close']
-    body = _body_size(o, c)
-    range_size = h - l
-    
-    if range_size == 0:
-        return False
-    
-    # Large bullish candle with minimal shadows
-    upper_shadow = _upper_shadow(h, o, c)
-    lower_shadow = _lower_shadow(l, o, c)
-    
-    return (_is_bullish(o, c) and
-            body / range_size > 0.9 and
-            upper_shadow < body * 0.05 and
-            lower_shadow < body * 0.05)
+    # Three candle patterns
+    first_midpoint = (o2 + c2) / 2
+    out[:, PATTERN_INDEX['MORNING_STAR']] = (
+        (c2 < o2) & (body2 > rng2 * 0.5) & (body1 < rng1 * 0.3)
+        & bullish & (c > first_midpoint) & down)
+    out[:, PATTERN_INDEX['EVENING_STAR']] = (
+        (c2 > o2) & (body2 > rng2 * 0.5) & (body1 < rng1 * 0.3)
+        & bearish & (c < first_midpoint) & up)
+
+    # Soldiers/crows: three large candles in the same direction
+    large = ~((rng > 0) & (body < rng * 0.6))
+    large1 = ~((rng1 > 0) & (body1 < rng1 * 0.6))
+    large2 = ~((rng2 > 0) & (body2 < rng2 * 0.6))
+    three_large = large & large1 & large2
+    out[:, PATTERN_INDEX['THREE_WHITE_SOLDIERS']] = (
+        three_large & bullish & (c1 > o1) & (c2 > o2) & (c1 > c2) & (c > c1))
+    out[:, PATTERN_INDEX['THREE_BLACK_CROWS']] = (
+        three_large & bearish & (c1 < o1) & (c2 < o2) & (c1 < c2) & (c < c1))
+
+    return out
 
 
 # ============================================================
@@ -483,91 +416,95 @@ def determine_trend(closes: pd.Series, lookback: int = 10) -> str:
     return 'neutral'
 
 
-def scan_patterns(df: pd.DataFrame) -> List[Dict]:
+def scan_patterns(df: pd.DataFrame, min_reliability: int = 1) -> List[Dict]:
     """
     Scan for all candlestick patterns in the data
     
     Args:
         df: DataFrame with OHLC data
+        min_reliability: Drop patterns rated below this (1-5)
     
     Returns:
-        List of detected patterns with details
+        List of detected patterns with details (shared, do not mutate)
     """
     if len(df) < 5:
         return []
     
-    patterns = []
-    trend = determine_trend(df['Close'])
-    
-    current = df.iloc[-1]
-    prev = df.iloc[-2] if len(df) > 1 else None
-    
-    # Single candle patterns
-    if detect_hammer(current, None, trend):
-        patterns.append({
-            "pattern": "HAMMER",
-            **CANDLESTICK_PATTERNS["HAMMER"]
-        })
+    o, h, l, c = (df[col].to_numpy(dtype=float) for col in ('Open', 'High', 'Low', 'Close'))
     
-    if detect_shooting_star(current, None, trend):
-        patterns.append({
-            "pattern": "SHOOTING_STAR", 
-            **CANDLESTICK_PATTERNS["SHOOTING_STAR"]
-        })
+    # Only the last bar is reported: its trend needs the last TREND_LOOKBACK
+    # closes, and no pattern spans more than MAX_PATTERN_CANDLES bars
+    trend = trend_codes(c[-TREND_LOOKBACK:], TREND_LOOKBACK)[-1]
+    tail = slice(-MAX_PATTERN_CANDLES, None)
     
-    if detect_doji(current, None, trend):
-        patterns.append({
-            "pattern": "DOJI",
-            **CANDLESTICK_PATTERNS["DOJI"]
-        })
-    
-    if detect_bullish_marubozu(current, None, trend):
-        patterns.append({
-            "pattern": "BULLISH_MARUBOZU",
-            **CANDLESTICK_PATTERNS["BULLISH_MARUBOZU"]
-        })
-    
-    # Two candle patterns
-    if prev is not None:
-        if detect_bullish_engulfing(current, prev, trend):
-            patterns.append({
-                "pattern": "BULLISH_ENGULFING",
-                **CANDLESTICK_PATTERNS["BULLISH_ENGULFING"]
-            })
-        
-        if detect_bearish_engulfing(current, prev, trend):
-            patterns.append({
-                "pattern": "BEARISH_ENGULFING",
-                **CANDLESTICK_PATTERNS["BEARISH_ENGULFING"]
-            })
-    
-    # Three candle patterns
-    if len(df) >= 3:
-        if detect_morning_star(df, trend):
-            patterns.append({
-                "pattern": "MORNING_STAR",
-                **CANDLESTICK_PATTERNS["MORNING_STAR"]
-            })
-        
-        if detect_evening_star(df, trend):
-            patterns.append({
-                "pattern": "EVENING_STAR",
-                **CANDLESTICK_PATTERNS["EVENING_STAR"]
-            })
-        
-        if detect_three_white_soldiers(df, trend):
-            patterns.append({
-                "pattern": "THREE_WHITE_SOLDIERS",
-                **CANDLESTICK_PATTERNS["THREE_WHITE_SOLDIERS"]
-            })
-        
-        if detect_three_black_crows(df, trend):
-            patterns.append({
-                "pattern": "THREE_BLACK_CROWS",
-                **CANDLESTICK_PATTERNS["THREE_BLACK_CROWS"]
-            })
+    matched = detect_all(o[tail], h[tail], l[tail], c[tail], trend)[-1]
+    matched &= PATTERN_RELIABILITY >= min_reliability
     
-    return patterns
+    return [PATTERN_RECORDS[i] for i in np.flatnonzero(matched)]
+
+
+def scan_patterns_bulk(df: pd.DataFrame, min_reliability: int = 1) -> pd.DataFrame:
+    """
+    Scan every bar of the history in one pass (for backtests)
+
+    Equivalent to calling scan_patterns on each prefix of `df`, without the
+    quadratic cost.
+
+    Args:
+        df: DataFrame with OHLC data
+        min_reliability: Drop patterns rated below this (1-5)
+
+    Returns:
+        Boolean DataFrame indexed like `df`, one column per pattern key.
+        Bars before the fifth are all False, as in scan_patterns.
+    """
+    o, h, l, c = (df[col].to_numpy(dtype=float) for col in ('Open', 'High', 'Low', 'Close'))
+
+    # Detect block by block so the ~30 temporaries detect_all allocates stay
+    # cache-sized; each block re-reads the bars its first candles look back on
+    trend = trend_codes(c)
+    halo = MAX_PATTERN_CANDLES - 1
+    matched = np.empty((len(c), N_PATTERNS), dtype=bool)
+    for start in range(0, len(c), SCAN_BLOCK):
+        lo, stop = max(start - halo, 0), start + SCAN_BLOCK
+        matched[start:stop] = detect_all(
+            o[lo:stop], h[lo:stop], l[lo:stop], c[lo:stop], trend[lo:stop])[start - lo:]
+    matched[:4] = False
+    keep = PATTERN_RELIABILITY >= min_reliability
+
+    return pd.DataFrame(matched[:, keep], index=df.index,
+                        columns=[k for k, ok in zip(PATTERN_KEYS, keep) if ok])
+
+
+def pattern_scores(matches: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    get_pattern_score for every bar of a detect_all matrix in one matrix product
+
+    Args:
+        matches: Boolean (n_bars, N_PATTERNS) matrix from detect_all
+        mask: Optional boolean mask over pattern ids restricting which count,
+            e.g. BULLISH_MASK & (PATTERN_RELIABILITY >= 4)
+
+    Returns:
+        Integer score per bar
+    """
+    weight = PATTERN_WEIGHT if mask is None else np.where(mask, PATTERN_WEIGHT, 0)
+    return matches @ weight
+
+
+def pack_patterns(matches: np.ndarray) -> np.ndarray:
+    """
+    Pack a detect_all matrix into one uint32 per bar, bit i set for pattern id i
+
+    Filter the result with BULLISH_BITS / BEARISH_BITS or PATTERN_BITS[id],
+    e.g. (bits & BULLISH_BITS) != 0 for bars with any bullish pattern.
+    """
+    return matches @ PATTERN_BITS
+
+
+def unpack_patterns(bits: np.ndarray) -> np.ndarray:
+    """Boolean (n_bars, N_PATTERNS) matrix from pack_patterns output"""
+    return (np.asarray(bits, dtype=np.uint32)[:, None] & PATTERN_BITS) != 0
 
 
 def get_bullish_patterns(patterns: List[Dict]) -> List[Dict]:
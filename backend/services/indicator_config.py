@@ -13,6 +13,9 @@ INDICATOR CATEGORIES:
 Each category has multiple indicators - you choose ONE from each.
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 # ============================================================
 # INDICATOR CATALOG - All available indicators by category
 # ============================================================
@@ -390,15 +393,20 @@ ALTERNATIVE_CONFIGS = {
 }
 
 
+# Indicator id -> catalog entry with its category and id, for O(1) lookups
+# Entries are read-only views shared within this module;
+# get_indicator_info hands callers their own copy
+INDICATOR_INDEX = {
+    ind_id: MappingProxyType({**ind_data, "category": category, "id": ind_id})
+    for category, data in INDICATOR_CATALOG.items()
+    for ind_id, ind_data in data["indicators"].items()
+}
+
+
 def get_indicator_info(indicator_id: str) -> dict:
     """Get detailed info about a specific indicator"""
-    for category, data in INDICATOR_CATALOG.items():
-        if indicator_id in data["indicators"]:
-            info = data["indicators"][indicator_id].copy()
-            info["category"] = category
-            info["id"] = indicator_id
-            return info
-    return None
+    info = INDICATOR_INDEX.get(indicator_id)
+    return dict(info) if info is not None else None
 
 
 def get_recommended_indicators() -> dict:
@@ -435,7 +443,7 @@ def validate_config(config: dict) -> tuple:
     for section, indicators in config.items():
         if isinstance(indicators, dict):
             for role, ind_id in indicators.items():
-                if not get_indicator_info(ind_id):
+                if ind_id not in INDICATOR_INDEX:
                     errors.append(f"Unknown indicator: {ind_id} in {section}.{role}")
     
     return errors, warnings
@@ -447,18 +455,38 @@ def validate_config(config: dict) -> tuple:
 
 def get_config_summary(config: dict) -> str:
     """Generate human-readable summary of indicator configuration"""
+    args = (
+        config.get('name', 'Custom'),
+        tuple(config.get("screen1_weekly", {}).items()),
+        tuple(config.get("screen2_daily", {}).items()),
+        tuple(config.get("screen3_entry", {}).items())
+    )
+    try:
+        return _config_summary(*args)
+    except TypeError:
+        # User configs may hold lists or dicts, which can't be a cache key
+        return _config_summary.__wrapped__(*args)
+
+
+def _summary_info(ind_id):
+    """Catalog entry for a configured indicator id, None if unknown or not an id"""
+    return INDICATOR_INDEX.get(ind_id) if isinstance(ind_id, str) else None
+
+
+@lru_cache(maxsize=64)
+def _config_summary(name: str, s1: tuple, s2: tuple, s3: tuple) -> str:
+    """get_config_summary on hashable (role, indicator_id) pairs per screen"""
     lines = [
         "═" * 60,
-        f"  INDICATOR CONFIGURATION: {config.get('name', 'Custom')}",
+        f"  INDICATOR CONFIGURATION: {name}",
         "═" * 60,
         "",
         "SCREEN 1 - WEEKLY (Strategic Direction)",
         "─" * 40,
     ]
     
-    s1 = config.get("screen1_weekly", {})
-    for role, ind_id in s1.items():
-        info = get_indicator_info(ind_id)
+    for role, ind_id in s1:
+        info = _summary_info(ind_id)
         if info:
             lines.append(f"  {role.upper()}: {info['name']}")
             lines.append(f"    → {info['description']}")
@@ -469,9 +497,8 @@ def get_config_summary(config: dict) -> str:
         "─" * 40,
     ])
     
-    s2 = config.get("screen2_daily", {})
-    for role, ind_id in s2.items():
-        info = get_indicator_info(ind_id)
+    for role, ind_id in s2:
+        info = _summary_info(ind_id)
         if info:
             lines.append(f"  {role.upper()}: {info['name']}")
     
@@ -481,9 +508,8 @@ def get_config_summary(config: dict) -> str:
         "─" * 40,
     ])
     
-    s3 = config.get("screen3_entry", {})
-    for role, ind_id in s3.items():
-        info = get_indicator_info(ind_id)
+    for role, ind_id in s3:
+        info = _summary_info(ind_id)
         if info:
             lines.append(f"  {role.upper()}: {info['name']}")
     
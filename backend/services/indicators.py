@@ -14,8 +14,270 @@ Indicators:
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 
+# Impulse System colors as int8 codes; IMPULSE_LABELS[code + 1] is the color
+IMPULSE_CODES = {'RED': -1, 'BLUE': 0, 'GREEN': 1}
+IMPULSE_LABELS = np.array(['RED', 'BLUE', 'GREEN'])
+
+# Bars detect_divergence compares by default
+DIVERGENCE_LOOKBACK = 20
+
+
+# ============================================================
+# NDARRAY KERNELS
+# ============================================================
+
+def _ema_np(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA recursion on a float array, matching pandas ewm(adjust=False)
+
+    Leading NaNs stay NaN until the first observation seeds the average.
+    A later NaN repeats the previous value, and, as with pandas' default
+    ignore_na=False, the old average keeps decaying across the gap, so the
+    next observation gets more weight. A 2-D array is smoothed column by
+    column (one ticker per column).
+    """
+    alpha = 2.0 / (period + 1)
+    beta = 1.0 - alpha
+    if values.ndim > 1:
+        return _ema_2d(values, alpha, beta)
+    out = np.empty(len(values))
+    weighted = np.nan
+    old_wt = 1.0
+    for i, x in enumerate(values.tolist()):
+        if weighted == weighted:
+            old_wt *= beta
+            if x == x:
+                if weighted != x:
+                    weighted = (old_wt * weighted + alpha * x) / (old_wt + alpha)
+                old_wt = 1.0
+        elif x == x:
+            weighted = x
+        out[i] = weighted
+    return out
+
+
+def _ema_2d(values: np.ndarray, alpha: float, beta: float) -> np.ndarray:
+    """_ema_np over the columns of a 2-D array, stepping all columns per row"""
+    out = np.empty(values.shape)
+    weighted = np.full(values.shape[1:], np.nan)
+    old_wt = np.ones(values.shape[1:])
+    for i, x in enumerate(values):
+        seeded = weighted == weighted
+        observed = x == x
+        old_wt = np.where(seeded, old_wt * beta, old_wt)
+        step = np.where(weighted != x, (old_wt * weighted + alpha * x) / (old_wt + alpha), weighted)
+        weighted = np.where(observed, np.where(seeded, step, x), weighted)
+        old_wt = np.where(seeded & observed, 1.0, old_wt)
+        out[i] = weighted
+    return out
+
+
+def _macd_np(values: np.ndarray, fast: int, slow: int, signal: int) -> tuple:
+    """
+    MACD line, signal line and histogram in one pass over a float array
+
+    Runs the fast, slow and signal EMA recursions side by side; identical to
+    _ema_np(values, fast) - _ema_np(values, slow) followed by _ema_np on that.
+    A 2-D array is handled column by column.
+    """
+    if values.ndim > 1:
+        macd_line = _ema_np(values, fast) - _ema_np(values, slow)
+        signal_line = _ema_np(macd_line, signal)
+        return macd_line, signal_line, macd_line - signal_line
+    a_fast, a_slow, a_signal = 2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1)
+    b_fast, b_slow, b_signal = 1.0 - a_fast, 1.0 - a_slow, 1.0 - a_signal
+    macd_line = np.empty(len(values))
+    signal_line = np.empty(len(values))
+    ema_fast = ema_slow = line = sig = np.nan
+    wt_fast = wt_slow = 1.0
+    for i, x in enumerate(values.tolist()):
+        if ema_fast == ema_fast:
+            # Old weights decay across NaN gaps, as in _ema_np
+            wt_fast *= b_fast
+            wt_slow *= b_slow
+            if x == x:
+                if ema_fast != x:
+                    ema_fast = (wt_fast * ema_fast + a_fast * x) / (wt_fast + a_fast)
+                if ema_slow != x:
+                    ema_slow = (wt_slow * ema_slow + a_slow * x) / (wt_slow + a_slow)
+                wt_fast = wt_slow = 1.0
+                line = ema_fast - ema_slow
+        elif x == x:
+            ema_fast = ema_slow = x
+            line = ema_fast - ema_slow
+        # The line holds its last value over NaN closes, so once seeded the
+        # signal sees an observation on every bar and its weight never decays
+        # past one step
+        if sig == sig:
+            if sig != line:
+                sig = (b_signal * sig + a_signal * line) / (b_signal + a_signal)
+        elif line == line:
+            sig = line
+        macd_line[i] = line
+        signal_line[i] = sig
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def _shift_np(values: np.ndarray) -> np.ndarray:
+    """Shift an array one step forward (along rows), padding with NaN"""
+    shifted = np.empty(values.shape)
+    shifted[0] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _pad_np(values: np.ndarray, n: int) -> np.ndarray:
+    """Left-pad an array with NaN to n rows"""
+    out = np.full((n,) + values.shape[1:], np.nan)
+    out[n - len(values):] = values
+    return out
+
+
+def _rolling_np(values: np.ndarray, window: int, func) -> np.ndarray:
+    """Apply a reduction over a trailing window of rows; the first window-1 rows are NaN"""
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        out[window - 1:] = func(sliding_window_view(values, window, axis=0), axis=-1)
+    return out
+
+
+def _rolling_mean_np(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over `window` rows; the first window-1 rows are NaN
+
+    Adds the window's shifted slices in place rather than reducing a
+    sliding_window_view, which is 2-3x faster for the short windows used
+    here. A NaN anywhere in a window makes that mean NaN, as np.mean would.
+    """
+    out = np.full(values.shape, np.nan)
+    m = len(values) - window + 1
+    if m > 0:
+        total = values[:m].copy()
+        for k in range(1, window):
+            total += values[k:k + m]
+        np.divide(total, window, out=out[window - 1:])
+    return out
+
+
+def _true_range_np(highs: np.ndarray, lows: np.ndarray, prev_closes: np.ndarray) -> np.ndarray:
+    """max(H-L, |H-PC|, |L-PC|) per bar, built in two buffers; the first bar (no PC) is H-L"""
+    true_range = highs - lows
+    gap = highs - prev_closes
+    np.fmax(true_range, np.abs(gap, out=gap), out=true_range)
+    np.subtract(lows, prev_closes, out=gap)
+    return np.fmax(true_range, np.abs(gap, out=gap), out=true_range)
+
+
+def stack_columns(arrays: list) -> np.ndarray:
+    """
+    Stack 1-D histories into a (bars, tickers) panel for compute_indicators
+
+    Histories are aligned on their last bar; shorter ones are left-padded
+    with NaN, which every kernel treats as "no data yet", so each column's
+    indicators equal those of its own history.
+    """
+    panel = np.full((max(len(a) for a in arrays), len(arrays)), np.nan)
+    for j, a in enumerate(arrays):
+        panel[len(panel) - len(a):, j] = a
+    return panel
+
+
+def compute_indicators(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                       volumes: np.ndarray, tail: int = None) -> dict:
+    """
+    Compute every Elder indicator series in a single pass over raw arrays
+
+    Each EMA is computed once and shared: the MACD's EMA(12)/EMA(26)/signal
+    recursions run in one fused pass, EMA(13) and the MACD histogram feed the
+    Impulse System, and the previous-close array is shared by Force Index and ATR.
+
+    Inputs are 1-D, or 2-D (bars, tickers) panels from stack_columns to run
+    a whole watchlist in one call; outputs have the same shape.
+
+    Args:
+        closes: Closing prices
+        highs: High prices
+        lows: Low prices
+        volumes: Volume data
+        tail: (optional) Only the last `tail` values of the windowed indicators
+            (stochastic, RSI, ATR) are needed; they are computed over just the
+            bars those values depend on and left NaN before that. EMA-based
+            series always cover the full history, since they depend on all of it.
+
+    Returns:
+        Dictionary of indicator arrays aligned with the inputs
+    """
+    n = len(closes)
+    prev_closes = _shift_np(closes)
+
+    ema_13 = _ema_np(closes, 13)
+    ema_22 = _ema_np(closes, 22)
+
+    # MACD (12, 26, 9)
+    macd_line, signal_line, histogram = _macd_np(closes, 12, 26, 9)
+
+    # Force Index
+    raw_force = (closes - prev_closes) * volumes
+    force_index_2 = _ema_np(raw_force, 2)
+    force_index_13 = _ema_np(raw_force, 13)
+
+    # Windowed indicators look back at most 14 + 3 - 1 bars (stochastic %D)
+    start = 0 if tail is None else max(n - tail - 15, 0)
+    c, h, l, pc = closes[start:], highs[start:], lows[start:], prev_closes[start:]
+
+    # Stochastic (14, 3)
+    lowest_low = _rolling_np(l, 14, np.min)
+    highest_high = _rolling_np(h, 14, np.max)
+    with np.errstate(divide='ignore', invalid='ignore'):  # flat window: NaN/inf like pandas
+        stoch_k = 100 * (c - lowest_low) / (highest_high - lowest_low)
+    stoch_d = _rolling_mean_np(stoch_k, 3)
+
+    # RSI (14). Bars before a column's first close (stack_columns padding)
+    # stay NaN rather than counting as flat bars in the averages
+    delta = c - pc
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    padding = np.isnan(np.fmax.accumulate(c, axis=0))
+    gain[padding] = loss[padding] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = _rolling_mean_np(gain, 14) / _rolling_mean_np(loss, 14)
+    rsi = 100 - (100 / (1 + rs))
+
+    # ATR (14)
+    atr = _rolling_mean_np(_true_range_np(h, l, pc), 14)
+
+    if start:
+        stoch_k, stoch_d, rsi, atr = (
+            _pad_np(a, n) for a in (stoch_k, stoch_d, rsi, atr))
+
+    # Impulse System slopes
+    ema_slope = ema_13 - _shift_np(ema_13)
+    macd_slope = histogram - _shift_np(histogram)
+
+    return {
+        'ema_13': ema_13,
+        'ema_22': ema_22,
+        'macd_line': macd_line,
+        'signal_line': signal_line,
+        'histogram': histogram,
+        'force_index_2': force_index_2,
+        'force_index_13': force_index_13,
+        'stoch_k': stoch_k,
+        'stoch_d': stoch_d,
+        'rsi': rsi,
+        'atr': atr,
+        'ema_slope': ema_slope,
+        'macd_slope': macd_slope
+    }
+
+
+# ============================================================
+# SERIES API
+# ============================================================
+
 def calculate_ema(data: pd.Series, period: int) -> pd.Series:
     """
     Calculate Exponential Moving Average
@@ -24,13 +286,15 @@ def calculate_ema(data: pd.Series, period: int) -> pd.Series:
     to new information than a simple moving average.
     
     Args:
-        data: Price series (typically closing prices)
+        data: Price series (typically closing prices), or a float array
         period: Number of periods (e.g., 13, 22, 26)
     
     Returns:
-        EMA series
+        EMA series (an array for array input)
     """
-    return data.ewm(span=period, adjust=False).mean()
+    if isinstance(data, np.ndarray):
+        return _ema_np(data.astype(np.float64, copy=False), period)
+    return pd.Series(_ema_np(data.to_numpy(dtype=np.float64), period), index=data.index)
 
 
 def calculate_macd(closes: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> dict:
@@ -49,24 +313,26 @@ def calculate_macd(closes: pd.Series, fast: int = 12, slow: int = 26, signal: in
     - Divergence between price and MACD-H is powerful signal
     
     Args:
-        closes: Closing prices
+        closes: Closing prices, as a series or a float array
         fast: Fast EMA period (default 12)
         slow: Slow EMA period (default 26)
         signal: Signal line period (default 9)
     
     Returns:
         Dictionary with macd_line, signal_line, histogram
+        (arrays for array input)
     """
-    ema_fast = calculate_ema(closes, fast)
-    ema_slow = calculate_ema(closes, slow)
-    macd_line = ema_fast - ema_slow
-    signal_line = calculate_ema(macd_line, signal)
-    histogram = macd_line - signal_line
+    if isinstance(closes, np.ndarray):
+        macd_line, signal_line, histogram = _macd_np(
+            closes.astype(np.float64, copy=False), fast, slow, signal)
+        return {'macd_line': macd_line, 'signal_line': signal_line, 'histogram': histogram}
+    macd_line, signal_line, histogram = _macd_np(
+        closes.to_numpy(dtype=np.float64), fast, slow, signal)
     
     return {
-        'macd_line': macd_line,
-        'signal_line': signal_line,
-        'histogram': histogram
+        'macd_line': pd.Series(macd_line, index=closes.index),
+        'signal_line': pd.Series(signal_line, index=closes.index),
+        'histogram': pd.Series(histogram, index=closes.index)
     }
 
 
@@ -90,8 +356,9 @@ def calculate_force_index(closes: pd.Series, volumes: pd.Series, period: int = 2
     Returns:
         Force Index series
     """
-    force_index = (closes - closes.shift(1)) * volumes
-    return calculate_ema(force_index, period)
+    c = closes.to_numpy(dtype=np.float64)
+    force_index = (c - _shift_np(c)) * volumes.to_numpy(dtype=np.float64)
+    return pd.Series(_ema_np(force_index, period), index=closes.index)
 
 
 def calculate_stochastic(highs: pd.Series, lows: pd.Series, closes: pd.Series, 
@@ -118,15 +385,16 @@ def calculate_stochastic(highs: pd.Series, lows: pd.Series, closes: pd.Series,
     Returns:
         Dictionary with stoch_k and stoch_d
     """
-    lowest_low = lows.rolling(window=period).min()
-    highest_high = highs.rolling(window=period).max()
+    lowest_low = _rolling_np(lows.to_numpy(dtype=np.float64), period, np.min)
+    highest_high = _rolling_np(highs.to_numpy(dtype=np.float64), period, np.max)
     
-    stoch_k = 100 * (closes - lowest_low) / (highest_high - lowest_low)
-    stoch_d = stoch_k.rolling(window=smooth_k).mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch_k = 100 * (closes.to_numpy(dtype=np.float64) - lowest_low) / (highest_high - lowest_low)
+    stoch_d = _rolling_mean_np(stoch_k, smooth_k)
     
     return {
-        'stoch_k': stoch_k,
-        'stoch_d': stoch_d
+        'stoch_k': pd.Series(stoch_k, index=closes.index),
+        'stoch_d': pd.Series(stoch_d, index=closes.index)
     }
 
 
@@ -150,17 +418,19 @@ def calculate_rsi(closes: pd.Series, period: int = 14) -> pd.Series:
     Returns:
         RSI series
     """
-    delta = closes.diff()
-    gain = delta.where(delta > 0, 0)
-    loss = (-delta.where(delta < 0, 0))
+    c = closes.to_numpy(dtype=np.float64)
+    delta = c - _shift_np(c)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
     
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
+    avg_gain = _rolling_mean_np(gain, period)
+    avg_loss = _rolling_mean_np(loss, period)
     
-    rs = avg_gain / avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     
-    return rsi
+    return pd.Series(rsi, index=closes.index)
 
 
 def calculate_atr(highs: pd.Series, lows: pd.Series, closes: pd.Series, period: int = 14) -> pd.Series:
@@ -185,17 +455,17 @@ def calculate_atr(highs: pd.Series, lows: pd.Series, closes: pd.Series, period:
     Returns:
         ATR series
     """
-    tr1 = highs - lows
-    tr2 = abs(highs - closes.shift(1))
-    tr3 = abs(lows - closes.shift(1))
+    h = highs.to_numpy(dtype=np.float64)
+    l = lows.to_numpy(dtype=np.float64)
+    prev_closes = _shift_np(closes.to_numpy(dtype=np.float64))
     
-    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = true_range.rolling(window=period).mean()
+    atr = _rolling_mean_np(_true_range_np(h, l, prev_closes), period)
     
-    return atr
+    return pd.Series(atr, index=closes.index)
 
 
-def calculate_impulse_system(closes: pd.Series, ema_period: int = 13) -> dict:
+def calculate_impulse_system(closes: pd.Series, ema_period: int = 13,
+                             ema: pd.Series = None, macd_result: dict = None) -> dict:
     """
     Calculate Elder's Impulse System
     
@@ -215,45 +485,40 @@ def calculate_impulse_system(closes: pd.Series, ema_period: int = 13) -> dict:
     Args:
         closes: Closing prices
         ema_period: EMA period (default 13)
+        ema: (optional) Precomputed EMA(ema_period) of closes, to avoid recomputing it
+        macd_result: (optional) Precomputed calculate_macd(closes) result
     
     Returns:
-        Dictionary with ema, ema_slope, macd_histogram, macd_slope, impulse_color
+        Dictionary with ema, ema_slope, macd_histogram, macd_slope,
+        impulse_code (int8, see IMPULSE_CODES) and impulse_color
     """
     # Calculate EMA
-    ema = calculate_ema(closes, ema_period)
-    ema_slope = ema - ema.shift(1)
+    if ema is None:
+        ema = calculate_ema(closes, ema_period)
+    e = ema.to_numpy()
+    es = e - _shift_np(e)
     
     # Calculate MACD Histogram
-    macd = calculate_macd(closes)
+    macd = macd_result if macd_result is not None else calculate_macd(closes)
     macd_histogram = macd['histogram']
-    macd_slope = macd_histogram - macd_histogram.shift(1)
-    
-    # Determine Impulse Color
-    def get_impulse_color(ema_slope_val, macd_slope_val):
-        if pd.isna(ema_slope_val) or pd.isna(macd_slope_val):
-            return 'BLUE'
-        if ema_slope_val > 0 and macd_slope_val > 0:
-            return 'GREEN'
-        elif ema_slope_val < 0 and macd_slope_val < 0:
-            return 'RED'
-        else:
-            return 'BLUE'
-    
-    impulse_colors = pd.Series([
-        get_impulse_color(ema_slope.iloc[i], macd_slope.iloc[i]) 
-        for i in range(len(closes))
-    ], index=closes.index)
+    h = macd_histogram.to_numpy()
+    ms = h - _shift_np(h)
+    
+    # Impulse code per bar (NaN slopes compare False and fall through to BLUE)
+    impulse_code = ((es > 0) & (ms > 0)).astype(np.int8) - ((es < 0) & (ms < 0))
     
     return {
         'ema': ema,
-        'ema_slope': ema_slope,
+        'ema_slope': pd.Series(es, index=closes.index),
         'macd_histogram': macd_histogram,
-        'macd_slope': macd_slope,
-        'impulse_color': impulse_colors
+        'macd_slope': pd.Series(ms, index=closes.index),
+        'impulse_code': pd.Series(impulse_code, index=closes.index),
+        'impulse_color': pd.Series(IMPULSE_LABELS[impulse_code + 1], index=closes.index)
     }
 
 
-def detect_divergence(prices: pd.Series, indicator: pd.Series, lookback: int = 20) -> dict:
+def detect_divergence(prices: pd.Series, indicator: pd.Series,
+                      lookback: int = DIVERGENCE_LOOKBACK) -> dict:
     """
     Detect bullish and bearish divergences
     
@@ -266,37 +531,29 @@ def detect_divergence(prices: pd.Series, indicator: pd.Series, lookback: int = 2
     - Look for divergence in MACD-H and RSI
     
     Args:
-        prices: Price series
-        indicator: Indicator series (RSI, MACD-H, etc.)
+        prices: Price series or array
+        indicator: Indicator series or array (RSI, MACD-H, etc.)
         lookback: Periods to look back for divergence
     
     Returns:
         Dictionary with bullish_divergence, bearish_divergence booleans
     """
+    prices = np.asarray(prices, dtype=float)
+    indicator = np.asarray(indicator, dtype=float)
+
     if len(prices) < lookback:
         return {'bullish': False, 'bearish': False}
     
-    recent_prices = prices.tail(lookback)
-    recent_indicator = indicator.tail(lookback)
-    
-    # Find local minima and maxima
-    price_min_idx = recent_prices.idxmin()
-    price_max_idx = recent_prices.idxmax()
-    
-    # Bullish: Price lower low but indicator higher low
-    current_price = prices.iloc[-1]
-    current_indicator = indicator.iloc[-1]
-    
-    # Simple divergence detection
-    price_trend = (prices.iloc[-1] - prices.iloc[-lookback]) / prices.iloc[-lookback]
-    indicator_trend = indicator.iloc[-1] - indicator.iloc[-lookback]
+    # Simple divergence detection: compare the window endpoints
+    price_trend = (prices[-1] - prices[-lookback]) / prices[-lookback]
+    indicator_trend = indicator[-1] - indicator[-lookback]
     
     bullish = price_trend < -0.02 and indicator_trend > 0  # Price down, indicator up
     bearish = price_trend > 0.02 and indicator_trend < 0   # Price up, indicator down
     
     return {
-        'bullish': bullish,
-        'bearish': bearish
+        'bullish': bool(bullish),
+        'bearish': bool(bearish)
     }
 
 
@@ -306,6 +563,8 @@ def calculate_all_indicators(highs: pd.Series, lows: pd.Series,
     Calculate all Elder indicators at once
     
     Returns comprehensive analysis with all indicators and their interpretations.
+    Inputs may be Series or float arrays; every indicator comes from a single
+    compute_indicators pass.
     
     Args:
         highs: High prices
@@ -316,53 +575,101 @@ def calculate_all_indicators(highs: pd.Series, lows: pd.Series,
     Returns:
         Dictionary with all indicator values and interpretations
     """
-    # Core indicators
-    ema_13 = calculate_ema(closes, 13)
-    ema_22 = calculate_ema(closes, 22)
-    
-    macd = calculate_macd(closes)
-    force_index_2 = calculate_force_index(closes, volumes, 2)
-    force_index_13 = calculate_force_index(closes, volumes, 13)
-    stochastic = calculate_stochastic(highs, lows, closes)
-    rsi = calculate_rsi(closes)
-    atr = calculate_atr(highs, lows, closes)
-    impulse = calculate_impulse_system(closes)
+    c = np.asarray(closes, dtype=np.float64)
+    # Only the latest windowed values are read, plus the RSI divergence window
+    ind = compute_indicators(
+        c,
+        np.asarray(highs, dtype=np.float64),
+        np.asarray(lows, dtype=np.float64),
+        np.asarray(volumes, dtype=np.float64),
+        tail=DIVERGENCE_LOOKBACK
+    )
+    return _latest_indicators(c, ind)
+
+
+def calculate_all_indicators_panel(highs: list, lows: list, closes: list,
+                                   volumes: list) -> list:
+    """
+    calculate_all_indicators for a whole watchlist in one compute_indicators call
+
+    Args:
+        highs, lows, closes, volumes: One float array per ticker; histories
+            may differ in length
+
+    Returns:
+        One calculate_all_indicators dictionary per ticker, in input order
+    """
+    closes = [np.asarray(a, dtype=np.float64) for a in closes]
+    ind = compute_indicators(
+        stack_columns(closes),
+        stack_columns([np.asarray(a, dtype=np.float64) for a in highs]),
+        stack_columns([np.asarray(a, dtype=np.float64) for a in lows]),
+        stack_columns([np.asarray(a, dtype=np.float64) for a in volumes]),
+        tail=DIVERGENCE_LOOKBACK
+    )
+    # Each ticker reads its own columns minus the NaN padding
+    return [
+        _latest_indicators(c, {k: v[len(v) - len(c):, j] for k, v in ind.items()})
+        for j, c in enumerate(closes)
+    ]
+
+
+def _latest_indicators(c: np.ndarray, ind: dict) -> dict:
+    """Latest values and interpretations from one ticker's compute_indicators arrays"""
+    ema_22 = ind['ema_22']
+    histogram = ind['histogram']
     
     # Divergences
-    macd_divergence = detect_divergence(closes, macd['histogram'])
-    rsi_divergence = detect_divergence(closes, rsi)
-    
-    # Get latest values
-    latest = {
-        'price': closes.iloc[-1],
-        'ema_13': ema_13.iloc[-1],
-        'ema_22': ema_22.iloc[-1],
-        'macd_line': macd['macd_line'].iloc[-1],
-        'macd_signal': macd['signal_line'].iloc[-1],
-        'macd_histogram': macd['histogram'].iloc[-1],
-        'macd_histogram_prev': macd['histogram'].iloc[-2] if len(macd['histogram']) > 1 else 0,
-        'force_index_2': force_index_2.iloc[-1],
-        'force_index_13': force_index_13.iloc[-1],
-        'stochastic_k': stochastic['stoch_k'].iloc[-1],
-        'stochastic_d': stochastic['stoch_d'].iloc[-1],
-        'rsi': rsi.iloc[-1],
-        'atr': atr.iloc[-1],
-        'impulse_color': impulse['impulse_color'].iloc[-1],
-        'ema_slope': impulse['ema_slope'].iloc[-1],
-        'macd_slope': impulse['macd_slope'].iloc[-1],
+    macd_divergence = detect_divergence(c, histogram)
+    rsi_divergence = detect_divergence(c, ind['rsi'])
+    
+    # Latest values as Python floats so the interpretation math below and the
+    # screener's rounding/scoring don't go through NumPy scalar dispatch
+    price = float(c[-1])
+    ema_22_last = float(ema_22[-1])
+    ema_22_back = float(ema_22[-5])
+    macd_h = float(histogram[-1])
+    macd_h_prev = float(histogram[-2]) if len(histogram) > 1 else 0
+    atr = float(ind['atr'][-1])
+    ema_slope = float(ind['ema_slope'][-1])
+    macd_slope = float(ind['macd_slope'][-1])
+    
+    # Impulse color of the latest bar
+    if ema_slope > 0 and macd_slope > 0:
+        impulse_color = 'GREEN'
+    elif ema_slope < 0 and macd_slope < 0:
+        impulse_color = 'RED'
+    else:
+        impulse_color = 'BLUE'
+    
+    return {
+        'price': price,
+        'ema_13': float(ind['ema_13'][-1]),
+        'ema_22': ema_22_last,
+        'macd_line': float(ind['macd_line'][-1]),
+        'macd_signal': float(ind['signal_line'][-1]),
+        'macd_histogram': macd_h,
+        'macd_histogram_prev': macd_h_prev,
+        'force_index_2': float(ind['force_index_2'][-1]),
+        'force_index_13': float(ind['force_index_13'][-1]),
+        'stochastic_k': float(ind['stoch_k'][-1]),
+        'stochastic_d': float(ind['stoch_d'][-1]),
+        'rsi': float(ind['rsi'][-1]),
+        'atr': atr,
+        'impulse_color': impulse_color,
+        'ema_slope': ema_slope,
+        'macd_slope': macd_slope,
         'bullish_divergence_macd': macd_divergence['bullish'],
         'bullish_divergence_rsi': rsi_divergence['bullish'],
         'bearish_divergence_macd': macd_divergence['bearish'],
-        'bearish_divergence_rsi': rsi_divergence['bearish']
+        'bearish_divergence_rsi': rsi_divergence['bearish'],
+        
+        # Interpretations
+        'ema_trend': 'UP' if ema_22_last > ema_22_back else 'DOWN' if ema_22_last < ema_22_back else 'FLAT',
+        'macd_rising': macd_h > macd_h_prev,
+        'price_vs_ema': ((price / ema_22_last) - 1) * 100 if ema_22_last else 0.0,
+        'channel_width': (atr * 2 / price) * 100 if price else 0.0
     }
-    
-    # Calculate interpretations
-    latest['ema_trend'] = 'UP' if latest['ema_22'] > ema_22.iloc[-5] else 'DOWN' if latest['ema_22'] < ema_22.iloc[-5] else 'FLAT'
-    latest['macd_rising'] = latest['macd_histogram'] > latest['macd_histogram_prev']
-    latest['price_vs_ema'] = ((latest['price'] / latest['ema_22']) - 1) * 100
-    latest['channel_width'] = (latest['atr'] * 2 / latest['price']) * 100
-    
-    return latest
 
 
 # Grading explanation for transparency
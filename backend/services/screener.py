@@ -11,12 +11,19 @@ Features:
 """
 
 import yfinance as yf
+import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import numpy as np
 import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from services.indicators import (
     calculate_all_indicators,
+    calculate_all_indicators_panel,
     calculate_ema,
     calculate_macd,
     get_grading_criteria
@@ -32,6 +39,12 @@ from services.indicator_config import (
 # Configure yfinance with proper timeout and headers
 yf.pdr_read = None  # Disable deprecated pandas_datareader
 
+# One keep-alive HTTP session shared by every Yahoo Finance request, so a scan
+# reuses pooled TLS connections instead of opening one per ticker
+SESSION = requests.Session()
+SESSION.headers['User-Agent'] = 'Mozilla/5.0'
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 # Default watchlists
 NASDAQ_100_TOP = [
@@ -49,7 +62,84 @@ NIFTY_50 = [
 ]
 
 
-def fetch_stock_data(symbol: str, period: str = '6mo', retries: int = 3) -> Optional[Dict]:
+# In-process cache of Yahoo Finance responses so the daily screen right after
+# the weekly screen (or a detail view) does not download the same data again.
+# Cached DataFrames are shared between callers and must be treated as read-only.
+CACHE_TTL_SECONDS = 600
+CACHE_MAX_ENTRIES = 512
+
+# Concurrent per-symbol fetches (matches the HTTP session's pool size)
+FETCH_WORKERS = 16
+
+_HIST_CACHE: 'OrderedDict[Tuple[str, str], Tuple[float, pd.DataFrame]]' = OrderedDict()
+_INFO_CACHE: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+_ANALYSIS_CACHE: 'OrderedDict[str, Tuple[float, Tuple[pd.DataFrame, Optional[Dict]]]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(cache: OrderedDict, key):
+    """Return a fresh cached value or None"""
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] >= CACHE_TTL_SECONDS:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(cache: OrderedDict, key, value):
+    """Store a value, evicting the least recently used entries"""
+    with _cache_lock:
+        cache[key] = (time.time(), value)
+        cache.move_to_end(key)
+        while len(cache) > CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+def cached_history(symbol: str, period: str = '6mo') -> Optional[pd.DataFrame]:
+    """Fetch price history through the TTL cache"""
+    key = (symbol, period)
+    hist = _cache_get(_HIST_CACHE, key)
+    if hist is None:
+        hist = yf.Ticker(symbol, session=SESSION).history(period=period, timeout=10)
+        if hist is not None and not hist.empty:
+            _cache_put(_HIST_CACHE, key, hist)
+    return hist
+
+
+def cached_info(symbol: str) -> Optional[Dict]:
+    """Fetch ticker info through the TTL cache"""
+    info = _cache_get(_INFO_CACHE, symbol)
+    if info is None:
+        info = yf.Ticker(symbol, session=SESSION).info
+        if isinstance(info, dict):
+            _cache_put(_INFO_CACHE, symbol, info)
+    return info
+
+
+def _stock_data(symbol: str, hist: pd.DataFrame, info: Optional[Dict] = None) -> Dict:
+    """
+    Build the fetch_stock_data structure
+
+    Without info, name and sector come from a cached ticker info if one
+    exists, otherwise they fall back to the symbol and 'Unknown'.
+    """
+    if info is None:
+        info = _cache_get(_INFO_CACHE, symbol) or {}
+    return {
+        'symbol': symbol,
+        'name': info.get('shortName', info.get('longName', symbol)),
+        'sector': info.get('sector', 'Unknown'),
+        'history': hist,
+        'info': info
+    }
+
+
+def fetch_stock_data(symbol: str, period: str = '6mo', retries: int = 3,
+                     with_info: bool = True) -> Optional[Dict]:
     """
     Fetch stock data from Yahoo Finance with retry logic
 
@@ -57,27 +147,26 @@ def fetch_stock_data(symbol: str, period: str = '6mo', retries: int = 3) -> Opti
         symbol: Stock ticker symbol
         period: Data period (default 6 months for indicator calculations)
         retries: Number of retry attempts (default 3)
+        with_info: Also fetch ticker info (name, sector, ...). Screens skip
+            it since scoring only uses price history.
 
     Returns:
         Dictionary with OHLCV data and info, or None if fetch fails
     """
     for attempt in range(retries):
         try:
-            # Create ticker with user agent to avoid blocking
-            ticker = yf.Ticker(
-                symbol,
-                session=None
-            )
-
             # Fetch history with timeout handling
-            hist = ticker.history(period=period, timeout=10)
+            hist = cached_history(symbol, period)
 
             if hist is None or hist.empty or len(hist) < 30:
                 print(
                     f"{symbol}: No price data found, symbol may be delisted (period={period})")
                 return None
 
-            info = ticker.info
+            if not with_info:
+                return _stock_data(symbol, hist)
+
+            info = cached_info(symbol)
 
             # Verify we have valid data
             if info is None or not isinstance(info, dict):
@@ -87,13 +176,7 @@ def fetch_stock_data(symbol: str, period: str = '6mo', retries: int = 3) -> Opti
                     continue
                 return None
 
-            return {
-                'symbol': symbol,
-                'name': info.get('shortName', info.get('longName', symbol)),
-                'sector': info.get('sector', 'Unknown'),
-                'history': hist,
-                'info': info
-            }
+            return _stock_data(symbol, hist, info)
         except Exception as e:
             print(
                 f"Attempt {attempt + 1}/{retries}: Failed to get ticker '{symbol}' reason: {e}")
@@ -104,6 +187,99 @@ def fetch_stock_data(symbol: str, period: str = '6mo', retries: int = 3) -> Opti
                 return None
 
 
+def fetch_stock_data_batch(symbols: List[str], period: str = '6mo') -> Dict[str, Dict]:
+    """
+    Fetch stock data for many symbols with a single Yahoo Finance download
+
+    Price history for the uncached part of the watchlist comes from one
+    yf.download call. Ticker info is not fetched (see _stock_data). Symbols
+    the batch download missed are retried individually with fetch_stock_data.
+
+    Args:
+        symbols: Stock ticker symbols
+        period: Data period (default 6 months for indicator calculations)
+
+    Returns:
+        Dictionary mapping symbol to the fetch_stock_data structure.
+        Symbols that could not be fetched are omitted.
+    """
+    histories = {}
+    missing = []
+    for symbol in symbols:
+        hist = _cache_get(_HIST_CACHE, (symbol, period))
+        if hist is not None:
+            histories[symbol] = hist
+        else:
+            missing.append(symbol)
+
+    frame = None
+    if missing:
+        try:
+            frame = yf.download(missing, period=period, group_by='ticker',
+                                threads=True, auto_adjust=True, progress=False,
+                                session=SESSION)
+        except Exception as e:
+            print(f"Batch download failed: {e}")
+
+    if frame is not None and not frame.empty:
+        multi = isinstance(frame.columns, pd.MultiIndex)
+        downloaded = set(frame.columns.get_level_values(0)) if multi else set()
+        for symbol in missing:
+            if multi and symbol in downloaded:
+                hist = frame[symbol].dropna()
+            elif not multi and len(missing) == 1:
+                hist = frame.dropna()
+            else:
+                continue
+            if len(hist) >= 30:
+                histories[symbol] = hist
+                _cache_put(_HIST_CACHE, (symbol, period), hist)
+
+    data = {}
+    retry = []
+    for symbol in symbols:
+        if symbol in histories:
+            data[symbol] = _stock_data(symbol, histories[symbol])
+        else:
+            print(f"{symbol}: Missing from batch download, retrying individually")
+            retry.append(symbol)
+
+    # Individual retries are network-bound, so run them concurrently
+    if retry:
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(retry))) as executor:
+            singles = executor.map(
+                lambda symbol: fetch_stock_data(symbol, period, with_info=False), retry)
+            for symbol, single in zip(retry, singles):
+                if single:
+                    data[symbol] = single
+    return data
+
+
+def _weekly_closes(hist: pd.DataFrame) -> np.ndarray:
+    """
+    Last close of each calendar week (weeks end on Sunday)
+
+    Same values as hist.resample('W').agg(...).dropna()['Close'], without
+    building the resampled frame: weeks where an OHLC column has no data
+    at all are dropped, as dropna() drops them.
+    """
+    if hist.empty:
+        return np.empty(0)
+    index = hist.index
+    if index.tz is not None:
+        index = index.tz_localize(None)  # bucket by exchange-local dates
+    days = index.to_numpy().astype('datetime64[D]').astype(np.int64)
+    # 1970-01-01 was a Thursday, so shifting by 3 days makes weeks run Monday-Sunday
+    week = (days + 3) // 7
+    starts = np.flatnonzero(np.diff(week, prepend=week[0] - 1))
+
+    ohlc = hist[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(ohlc)
+    complete = np.logical_or.reduceat(valid, starts, axis=0).all(axis=1)
+    last = np.maximum.reduceat(np.where(valid[:, 3], np.arange(len(ohlc)), -1), starts)
+    return ohlc[last[complete], 3]
+
+
 def analyze_weekly_trend(hist: pd.DataFrame) -> Dict:
     """
     Screen 1: Analyze weekly trend using Elder's methodology
@@ -118,16 +294,10 @@ def analyze_weekly_trend(hist: pd.DataFrame) -> Dict:
     Returns:
         Dictionary with weekly trend analysis
     """
-    # Resample to weekly if we have daily data
-    weekly = hist.resample('W').agg({
-        'Open': 'first',
-        'High': 'max',
-        'Low': 'min',
-        'Close': 'last',
-        'Volume': 'sum'
-    }).dropna()
-
-    if len(weekly) < 26:  # Need enough data for MACD
+    # Weekly closes from the daily data
+    closes = _weekly_closes(hist)
+
+    if len(closes) < 26:  # Need enough data for MACD
         return {
             'weekly_ema_slope': 'INSUFFICIENT_DATA',
             'weekly_macd_rising': False,
@@ -135,20 +305,17 @@ def analyze_weekly_trend(hist: pd.DataFrame) -> Dict:
             'weekly_bullish': False
         }
 
-    closes = weekly['Close']
-
-    # Calculate weekly indicators
+    # Calculate weekly indicators (arrays in, arrays out)
     ema_22 = calculate_ema(closes, 22)
-    macd = calculate_macd(closes)
+    histogram = calculate_macd(closes)['histogram']
 
-    # Get current and previous values
-    current_ema = ema_22.iloc[-1]
-    prev_ema = ema_22.iloc[-2] if len(ema_22) > 1 else current_ema
+    # Get current and previous values (at least 26 weeks, checked above)
+    current_ema = ema_22[-1]
+    prev_ema = ema_22[-2]
     ema_slope = current_ema - prev_ema
 
-    current_macd_h = macd['histogram'].iloc[-1]
-    prev_macd_h = macd['histogram'].iloc[-2] if len(
-        macd['histogram']) > 1 else current_macd_h
+    current_macd_h = histogram[-1]
+    prev_macd_h = histogram[-2]
     macd_rising = current_macd_h > prev_macd_h
 
     # Determine weekly trend
@@ -355,13 +522,7 @@ def scan_stock(symbol: str, config: Dict = None) -> Optional[Dict]:
     """
     Complete analysis of a single stock
 
-    Performs:
-    1. Data fetch
-    2. Weekly trend analysis (Screen 1)
-    3. Daily indicator calculation (Screen 2)
-    4. Candlestick pattern recognition
-    5. Signal strength scoring
-    6. Trade level calculation
+    Fetches data for the symbol and runs analyze_stock on it.
 
     Args:
         symbol: Stock ticker
@@ -370,26 +531,128 @@ def scan_stock(symbol: str, config: Dict = None) -> Optional[Dict]:
     Returns:
         Complete analysis dictionary or None if failed
     """
-    if config is None:
-        config = DEFAULT_INDICATOR_CONFIG
-
-    # Fetch data
     data = fetch_stock_data(symbol)
     if not data:
         return None
+    return analyze_stock(data, config)
+
+
+def scan_stocks(symbols: List[str], config: Dict = None) -> Tuple[List[Dict], List[str]]:
+    """
+    Analyze a list of stocks from a single batch fetch
+
+    Args:
+        symbols: Stock tickers
+        config: Optional indicator configuration (uses default if None)
+
+    Returns:
+        Tuple of (analysis results in symbol order, failed symbols)
+    """
+    batch = fetch_stock_data_batch(symbols)
+
+    # Daily indicators for every symbol that needs a fresh analysis, computed
+    # across the watchlist in one panel pass
+    stale = [batch[s] for s in symbols
+             if s in batch and (config is not None or _cached_analysis(batch[s]) is None)]
+    panel = {}
+    if stale:
+        try:
+            panel = dict(zip(
+                (data['symbol'] for data in stale),
+                calculate_all_indicators_panel(
+                    *([data['history'][col].to_numpy(dtype=np.float64) for data in stale]
+                      for col in ('High', 'Low', 'Close', 'Volume')))
+            ))
+        except Exception as e:
+            print(f"Panel indicators failed, computing per symbol: {e}")
+
+    results = []
+    failed_symbols = []
+    for idx, symbol in enumerate(symbols):
+        try:
+            print(f"[{idx+1}/{len(symbols)}] Analyzing {symbol}...")
+            data = batch.get(symbol)
+            analysis = _analyze_cached(data, config, panel.get(symbol)) if data else None
+            if analysis:
+                results.append(analysis)
+            else:
+                failed_symbols.append(symbol)
+                print(f"  → Failed to analyze {symbol}")
+        except Exception as e:
+            print(f"  → Error scanning {symbol}: {e}")
+            failed_symbols.append(symbol)
+
+    return results, failed_symbols
+
+
+def _cached_analysis(data: Dict) -> Optional[Tuple[pd.DataFrame, Optional[Dict]]]:
+    """The cached default-config analysis entry, if it is for this exact history"""
+    entry = _cache_get(_ANALYSIS_CACHE, data['symbol'])
+    if entry is None or entry[0] is not data['history']:
+        return None
+    return entry
+
+
+def _analyze_cached(data: Dict, config: Dict = None,
+                    indicators: Dict = None) -> Optional[Dict]:
+    """
+    analyze_stock, reusing the last default-config analysis of a symbol
+
+    The history cache hands out the same DataFrame until it expires, so while
+    it does the analysis cannot have changed; the daily screen right after the
+    weekly screen gets it without recomputing. Returns a copy, since callers
+    add fields to the result.
+    """
+    if config is not None:
+        return analyze_stock(data, config, indicators)
+    entry = _cached_analysis(data)
+    if entry is None:
+        entry = (data['history'], analyze_stock(data, indicators=indicators))
+        _cache_put(_ANALYSIS_CACHE, data['symbol'], entry)
+    if entry[1] is None:
+        return None
+    return {**entry[1], 'name': data['name'], 'sector': data['sector']}
 
+
+def analyze_stock(data: Dict, config: Dict = None,
+                  indicators: Dict = None) -> Optional[Dict]:
+    """
+    Complete analysis of fetched stock data
+
+    Performs:
+    1. Weekly trend analysis (Screen 1)
+    2. Daily indicator calculation (Screen 2)
+    3. Candlestick pattern recognition
+    4. Signal strength scoring
+    5. Trade level calculation
+
+    Args:
+        data: Stock data as returned by fetch_stock_data
+        config: Optional indicator configuration (uses default if None)
+        indicators: Precomputed calculate_all_indicators result for the
+            history, e.g. from calculate_all_indicators_panel
+
+    Returns:
+        Complete analysis dictionary
+    """
+    if config is None:
+        config = DEFAULT_INDICATOR_CONFIG
+
+    symbol = data['symbol']
     hist = data['history']
 
+    # Pull the OHLCV columns out of the frame once
+    closes = hist['Close'].to_numpy(dtype=np.float64)
+    highs = hist['High'].to_numpy(dtype=np.float64)
+    lows = hist['Low'].to_numpy(dtype=np.float64)
+    volumes = hist['Volume'].to_numpy(dtype=np.float64)
+
     # Weekly analysis (Screen 1)
     weekly = analyze_weekly_trend(hist)
 
     # Daily indicators (Screen 2)
-    indicators = calculate_all_indicators(
-        hist['High'],
-        hist['Low'],
-        hist['Close'],
-        hist['Volume']
-    )
+    if indicators is None:
+        indicators = calculate_all_indicators(highs, lows, closes, volumes)
 
     # Candlestick patterns
     patterns = scan_patterns(hist)
@@ -403,8 +666,8 @@ def scan_stock(symbol: str, config: Dict = None) -> Optional[Dict]:
     levels = calculate_trade_levels(indicators['price'], indicators['atr'])
 
     # Get price change
-    current_price = hist['Close'].iloc[-1]
-    prev_price = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
+    current_price = float(closes[-1])
+    prev_price = float(closes[-2]) if len(closes) > 1 else current_price
     change = current_price - prev_price
     change_pct = (change / prev_price) * 100
 
@@ -481,41 +744,25 @@ def run_weekly_screen(market: str = 'US', symbols: List[str] = None) -> Dict:
     if symbols is None:
         symbols = NASDAQ_100_TOP if market == 'US' else NIFTY_50
 
-    results = []
-    passed = []
-    failed_symbols = []
-
     print(
         f"Starting weekly screen for {market} market with {len(symbols)} symbols...")
 
-    for idx, symbol in enumerate(symbols):
-        try:
-            print(f"[{idx+1}/{len(symbols)}] Scanning {symbol}...")
-            analysis = scan_stock(symbol)
-            if analysis:
-                results.append(analysis)
-                if analysis['weekly_bullish']:
-                    passed.append(analysis)
-            else:
-                failed_symbols.append(symbol)
-                print(f"  → Failed to analyze {symbol}")
-        except Exception as e:
-            print(f"  → Error scanning {symbol}: {e}")
-            failed_symbols.append(symbol)
-
-        # Rate limiting - pause between requests to avoid overwhelming Yahoo Finance
-        if idx < len(symbols) - 1:
-            time.sleep(0.5)
+    results, failed_symbols = scan_stocks(symbols)
 
     # Sort by signal strength
     results.sort(key=lambda x: x['signal_strength'], reverse=True)
-    passed.sort(key=lambda x: x['signal_strength'], reverse=True)
 
-    # Categorize results
-    a_trades = [r for r in results if r['is_a_trade']]
-    b_trades = [r for r in results if r['grade'] == 'B']
-    watch = [r for r in results if r['grade'] == 'C']
-    avoid = [r for r in results if r['grade'] == 'AVOID']
+    # Categorize results in one pass (buckets keep the sorted order)
+    grades = {'A': [], 'B': [], 'C': [], 'AVOID': []}
+    passed_count = 0
+    for r in results:
+        grades[r['grade']].append(r)
+        passed_count += bool(r['weekly_bullish'])
+
+    a_trades = [r for r in grades['A'] if r['is_a_trade']]
+    b_trades = grades['B']
+    watch = grades['C']
+    avoid = grades['AVOID']
 
     print(
         f"Weekly scan complete: {len(results)}/{len(symbols)} stocks analyzed successfully")
@@ -528,7 +775,7 @@ def run_weekly_screen(market: str = 'US', symbols: List[str] = None) -> Dict:
         'total_analyzed': len(results),
         'total_failed': len(failed_symbols),
         'failed_symbols': failed_symbols,
-        'weekly_bullish_count': len(passed),
+        'weekly_bullish_count': passed_count,
 
         'summary': {
             'a_trades': len(a_trades),
@@ -564,34 +811,17 @@ def run_daily_screen(weekly_results: List[Dict]) -> Dict:
         }
 
     symbols = [r['symbol'] for r in weekly_results]
-    results = []
-    failed_symbols = []
 
     print(f"Starting daily screen on {len(symbols)} symbols...")
 
-    for idx, symbol in enumerate(symbols):
-        try:
-            print(f"[{idx+1}/{len(symbols)}] Daily scan {symbol}...")
-            analysis = scan_stock(symbol)
-            if analysis:
-                # Re-check daily conditions
-                daily_ready = (
-                    analysis['force_index'] < 0 or
-                    analysis['stochastic'] < 50 or
-                    analysis['impulse_color'] != 'RED'
-                )
-                analysis['daily_ready'] = daily_ready
-                results.append(analysis)
-            else:
-                failed_symbols.append(symbol)
-                print(f"  → Failed to analyze {symbol}")
-        except Exception as e:
-            print(f"  → Error scanning {symbol}: {e}")
-            failed_symbols.append(symbol)
-
-        # Rate limiting
-        if idx < len(symbols) - 1:
-            time.sleep(0.5)
+    results, failed_symbols = scan_stocks(symbols)
+    for analysis in results:
+        # Re-check daily conditions
+        analysis['daily_ready'] = (
+            analysis['force_index'] < 0 or
+            analysis['stochastic'] < 50 or
+            analysis['impulse_color'] != 'RED'
+        )
 
     # Sort by signal strength
     results.sort(key=lambda x: x['signal_strength'], reverse=True)
@@ -0,0 +1,42 @@
+"""
+Indicator catalog lookups
+"""
+
+import orjson
+
+from services.indicator_config import INDICATOR_CATALOG, get_config_summary, get_indicator_info
+
+
+def test_indicator_info_is_a_private_copy():
+    category, data = next(iter(INDICATOR_CATALOG.items()))
+    ind_id = next(iter(data['indicators']))
+
+    info = get_indicator_info(ind_id)
+    assert type(info) is dict
+    assert info['category'] == category and info['id'] == ind_id
+    orjson.dumps(info)
+
+    info['name'] = 'changed'
+    info['annotation'] = True
+    again = get_indicator_info(ind_id)
+    assert again['name'] == data['indicators'][ind_id]['name']
+    assert 'annotation' not in again
+
+
+def test_unknown_indicator():
+    assert get_indicator_info('no_such_indicator') is None
+
+
+def test_config_summary_accepts_unhashable_values():
+    config = {
+        'name': 'User config',
+        'screen1_weekly': {'trend': 'ema_22', 'extra': ['ema_13', 'macd']},
+        'screen2_daily': {'oscillator': {'id': 'rsi'}},
+        'screen3_entry': {},
+    }
+    summary = get_config_summary(config)
+    assert 'User config' in summary
+    assert summary == get_config_summary(config)
+
+    hashable = {**config, 'screen1_weekly': {'trend': 'ema_22'}, 'screen2_daily': {}}
+    assert get_config_summary(hashable) == get_config_summary(dict(hashable))
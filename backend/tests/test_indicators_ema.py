@@ -0,0 +1,35 @@
+"""
+The EMA kernels must reproduce pandas ewm(span, adjust=False), gaps included
+"""
+
+import numpy as np
+import pandas as pd
+
+from services.indicators import calculate_ema, calculate_macd
+
+
+def _ewm(series, span):
+    return series.ewm(span=span, adjust=False).mean()
+
+
+def test_ema_decays_across_gaps_like_pandas():
+    closes = pd.Series([1, 2, 3, 4, 5, np.nan, 6, 7, 8, 9], dtype=float)
+    pd.testing.assert_series_equal(calculate_ema(closes, 3), _ewm(closes, 3))
+    assert calculate_ema(closes, 3).iloc[6] == 5.354166666666667
+
+
+def test_ema_and_macd_match_pandas():
+    rng = np.random.default_rng(3)
+    closes = pd.Series(100 + np.cumsum(rng.normal(0, 1, 300)))
+    closes[:2] = np.nan
+    closes[rng.random(300) < 0.05] = np.nan
+
+    for span in (2, 13, 22):
+        pd.testing.assert_series_equal(calculate_ema(closes, span), _ewm(closes, span))
+
+    line = _ewm(closes, 12) - _ewm(closes, 26)
+    signal = _ewm(line, 9)
+    macd = calculate_macd(closes)
+    pd.testing.assert_series_equal(macd['macd_line'], line)
+    pd.testing.assert_series_equal(macd['signal_line'], signal)
+    pd.testing.assert_series_equal(macd['histogram'], line - signal)
@@ -0,0 +1,59 @@
+"""
+Panel (bars x tickers) indicators must equal the single-ticker ones
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from services.indicators import calculate_all_indicators, calculate_all_indicators_panel
+
+
+def _history(rng, n):
+    closes = 100 + np.cumsum(rng.normal(0, 1, n))
+    highs = closes + np.abs(rng.normal(0, 1, n))
+    lows = closes - np.abs(rng.normal(0, 1, n))
+    volumes = rng.integers(100_000, 1_000_000, n).astype(float)
+    return highs, lows, closes, volumes
+
+
+def _flat(n):
+    """A history whose last bars never move: zero stochastic range, no RSI losses"""
+    closes = np.full(n, 50.0)
+    return closes.copy(), closes.copy(), closes, np.full(n, 1000.0)
+
+
+def _same(a, b):
+    return a == b or (a != a and b != b)
+
+
+@pytest.mark.parametrize('lengths', [
+    (31, 130),
+    (30, 35, 60, 250),
+    (130, 125, 118, 111, 104),
+])
+def test_panel_matches_single_ticker(lengths):
+    rng = np.random.default_rng(sum(lengths))
+    histories = [_history(rng, n) for n in lengths]
+
+    panel = calculate_all_indicators_panel(*zip(*histories))
+
+    for history, result in zip(histories, panel):
+        single = calculate_all_indicators(*history)
+        assert result.keys() == single.keys()
+        mismatched = {k for k in single if not _same(result[k], single[k])}
+        assert not mismatched, f'{len(history[2])} bars: {mismatched}'
+
+
+def test_flat_bars_compute_silently():
+    rng = np.random.default_rng(11)
+    histories = [_flat(60), _history(rng, 120)]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        panel = calculate_all_indicators_panel(*zip(*histories))
+        singles = [calculate_all_indicators(*history) for history in histories]
+
+    for single, result in zip(singles, panel):
+        assert not {k for k in single if not _same(result[k], single[k])}
@@ -0,0 +1,38 @@
+"""
+scan_stocks (one indicator panel per watchlist) must agree with analyzing
+each symbol on its own, as /api/stock/<symbol> does
+"""
+
+import numpy as np
+import pandas as pd
+
+from services import screener
+
+
+def _cache_history(symbol, n, rng):
+    index = pd.bdate_range(end='2025-06-27', periods=n, tz='America/New_York')
+    closes = 100 + np.cumsum(rng.normal(0, 1, n))
+    hist = pd.DataFrame({
+        'Open': closes + rng.normal(0, 0.5, n),
+        'High': closes + 1 + np.abs(rng.normal(0, 1, n)),
+        'Low': closes - 1 - np.abs(rng.normal(0, 1, n)),
+        'Close': closes,
+        'Volume': rng.integers(100_000, 1_000_000, n).astype(float),
+    }, index=index)
+    screener._cache_put(screener._HIST_CACHE, (symbol, '6mo'), hist)
+
+
+def test_scan_matches_single_symbol_analysis():
+    rng = np.random.default_rng(7)
+    lengths = [130] + list(range(30, 50)) + [80, 125]
+    symbols = [f'T{n}' for n in lengths]
+    for symbol, n in zip(symbols, lengths):
+        _cache_history(symbol, n, rng)
+    screener._ANALYSIS_CACHE.clear()
+
+    results, failed = screener.scan_stocks(symbols)
+
+    assert failed == []
+    batch = screener.fetch_stock_data_batch(symbols)
+    expected = [screener.analyze_stock(batch[symbol]) for symbol in symbols]
+    assert results == expected